@@ -0,0 +1,232 @@
+"""
+Benchmarks of the SDK hot paths, run against the local emulator
+
+Usage:
+    python benchmarks/run.py                      # run and compare with baseline.json
+    python benchmarks/run.py --save               # run and store the results as baseline
+    python benchmarks/run.py --only webhook       # run the benchmarks matching a name
+    python benchmarks/run.py --threshold 0.2      # fail when 20% slower than the baseline
+
+Every benchmark reports the best of ``--repeat`` runs in microseconds per
+operation. Baselines depend on the machine, store your own before comparing.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from chapa import AsyncChapa, Chapa, ChapaEmulator, verify_webhook_bytes  # noqa: E402
+from chapa.api import convert_response  # noqa: E402
+from chapa.models import TransactionVerification, decode  # noqa: E402
+from chapa.webhook import WebhookVerifier  # noqa: E402
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SECRET = "benchmark-secret"
+CONCURRENT_REQUESTS = 200
+CONCURRENCY = 20
+CONCURRENT_LATENCY = 0.005
+WEBHOOK_SIZES = (1_024, 16_384, 262_144)
+
+VERIFY_RESPONSE = {
+    "message": "Payment details",
+    "status": "success",
+    "data": {
+        "first_name": "Abebe", "last_name": "Bikila", "email": "user@example.com",
+        "currency": "ETB", "amount": "1,311.00", "charge": "45.89", "mode": "test",
+        "method": "test", "type": "API", "status": "success", "reference": "6jnheVKQEmy",
+        "tx_ref": "tx-1", "customization": {"title": "Example.com", "description": "Payment",
+                                            "logo": None},
+        "meta": None, "created_at": "2022-08-24T12:29:52.000000Z",
+        "updated_at": "2022-08-24T12:29:52.000000Z",
+    },
+}
+
+
+def measure(func: Callable[[], object], number: int, repeat: int) -> float:
+    """Best time of ``repeat`` runs of ``number`` calls, in microseconds per call"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def sync_client(emulator: ChapaEmulator, **kwargs) -> Chapa:
+    chapa = Chapa(SECRET, **kwargs)
+    chapa.client = httpx.Client(transport=emulator.transport())
+    return chapa
+
+
+def bench_initialize(number: int, repeat: int) -> float:
+    chapa = sync_client(ChapaEmulator(SECRET, settle_after=None))
+    counter = iter(range(10**9))
+    return measure(
+        lambda: chapa.initialize(
+            email="user@example.com", amount=100, first_name="Abebe", last_name="Bikila",
+            tx_ref=f"tx-{next(counter)}",
+        ),
+        number, repeat,
+    )
+
+
+def bench_verify(number: int, repeat: int) -> float:
+    emulator = ChapaEmulator(SECRET)
+    chapa = sync_client(emulator)
+    chapa.initialize(
+        email="user@example.com", amount=100, first_name="Abebe", last_name="Bikila", tx_ref="tx-1"
+    )
+    return measure(lambda: chapa.verify("tx-1"), number, repeat)
+
+
+def bench_verify_obj(number: int, repeat: int) -> float:
+    emulator = ChapaEmulator(SECRET)
+    chapa = sync_client(emulator, response_format="obj")
+    chapa.initialize(
+        email="user@example.com", amount=100, first_name="Abebe", last_name="Bikila", tx_ref="tx-1"
+    )
+    return measure(lambda: chapa.verify("tx-1").data.status, number, repeat)
+
+
+def bench_convert_obj(number: int, repeat: int) -> float:
+    return measure(lambda: convert_response(VERIFY_RESPONSE).data.customization.title, number, repeat)
+
+
+def bench_convert_model(number: int, repeat: int) -> float:
+    return measure(lambda: decode(VERIFY_RESPONSE, TransactionVerification), number, repeat)
+
+
+def _seed(emulator: ChapaEmulator) -> List[str]:
+    chapa = sync_client(emulator)
+    tx_refs = [f"tx-{index}" for index in range(CONCURRENT_REQUESTS)]
+    for tx_ref in tx_refs:
+        chapa.initialize(
+            email="user@example.com", amount=100, first_name="Abebe", last_name="Bikila",
+            tx_ref=tx_ref,
+        )
+    return tx_refs
+
+
+def bench_verify_many_sync(number: int, repeat: int) -> float:
+    emulator = ChapaEmulator(SECRET)
+    tx_refs = _seed(emulator)
+    emulator.latency = CONCURRENT_LATENCY
+    chapa = sync_client(emulator)
+    per_batch = measure(
+        lambda: list(chapa.verify_many(tx_refs, concurrency=CONCURRENCY)), 1, repeat
+    )
+    return per_batch / len(tx_refs)
+
+
+def bench_verify_many_async(number: int, repeat: int) -> float:
+    emulator = ChapaEmulator(SECRET)
+    tx_refs = _seed(emulator)
+    emulator.latency = CONCURRENT_LATENCY
+
+    async def batch():
+        chapa = AsyncChapa(SECRET)
+        chapa.client = httpx.AsyncClient(transport=emulator.async_transport())
+        async with chapa:
+            return [result async for result in chapa.verify_many(tx_refs, concurrency=CONCURRENCY)]
+
+    per_batch = measure(lambda: asyncio.run(batch()), 1, repeat)
+    return per_batch / len(tx_refs)
+
+
+def _webhook_body(size: int) -> bytes:
+    payload = dict(VERIFY_RESPONSE["data"], event="charge.success")
+    payload["meta"] = {"note": "x" * max(0, size - len(json.dumps(payload)))}
+    return json.dumps(payload).encode()
+
+
+def bench_webhook(size: int) -> Callable[[int, int], float]:
+    def bench(number: int, repeat: int) -> float:
+        body = _webhook_body(size)
+        signature = WebhookVerifier(SECRET).signature(body)
+        return measure(lambda: verify_webhook_bytes(SECRET, body, signature), number, repeat)
+
+    return bench
+
+
+def bench_webhook_verifier(size: int) -> Callable[[int, int], float]:
+    def bench(number: int, repeat: int) -> float:
+        body = _webhook_body(size)
+        verifier = WebhookVerifier(SECRET)
+        signature = verifier.signature(body)
+        return measure(lambda: verifier.verify(body, signature), number, repeat)
+
+    return bench
+
+
+# name -> (benchmark, calls per run)
+BENCHMARKS: Dict[str, Tuple[Callable[[int, int], float], int]] = {
+    "initialize": (bench_initialize, 500),
+    "verify": (bench_verify, 1000),
+    "verify_obj": (bench_verify_obj, 1000),
+    "convert_obj": (bench_convert_obj, 20000),
+    "convert_model": (bench_convert_model, 20000),
+    "verify_many_sync": (bench_verify_many_sync, 1),
+    "verify_many_async": (bench_verify_many_async, 1),
+}
+for _size in WEBHOOK_SIZES:
+    BENCHMARKS[f"webhook_{_size // 1024}k"] = (bench_webhook(_size), max(50, 2_000_000 // _size))
+    BENCHMARKS[f"webhook_verifier_{_size // 1024}k"] = (
+        bench_webhook_verifier(_size), max(50, 2_000_000 // _size)
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", help="run the benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each benchmark")
+    parser.add_argument("--save", action="store_true", help="store the results as baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="exit with 1 when a benchmark is slower than baseline by this ratio")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file).get("results", {})
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<24}{'us/op':>12}{'baseline':>12}{'change':>10}")
+    for name, (bench, number) in BENCHMARKS.items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = round(bench(number, args.repeat), 3)
+        previous = baseline.get(name)
+        change = ""
+        if previous:
+            ratio = results[name] / previous - 1
+            change = f"{ratio:+.1%}"
+            if args.threshold is not None and ratio > args.threshold:
+                regressions.append(name)
+        print(f"{name:<24}{results[name]:>12.2f}{previous or '':>12}{change:>10}")
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({"python": sys.version.split()[0], "httpx": httpx.__version__,
+                       "results": baseline}, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+    if regressions:
+        print(f"slower than baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Stress check of a single Chapa instance shared by many threads
+
+Usage:
+    python benchmarks/stress_threads.py --threads 64 --requests 200
+
+Every thread initializes and verifies its own transactions against the
+local emulator through the same ``Chapa`` instance, then the script checks
+that every response belongs to the request that sent it, that the headers
+passed by the callers were left untouched and that no request failed.
+Exits with 1 on the first inconsistency.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from chapa import Chapa, ChapaEmulator, MetricsCollector, pool_limits  # noqa: E402
+
+
+SECRET = "stress-secret"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64, help="concurrent threads")
+    parser.add_argument("--requests", type=int, default=200, help="transactions per thread")
+    parser.add_argument("--latency", type=float, default=0.0, help="emulated latency in seconds")
+    args = parser.parse_args(argv)
+
+    emulator = ChapaEmulator(SECRET, latency=args.latency)
+    metrics = MetricsCollector()
+    chapa = Chapa(SECRET, limits=pool_limits(args.threads), instrumentation=metrics)
+    chapa.client = httpx.Client(
+        transport=emulator.transport(), limits=pool_limits(args.threads)
+    )
+    errors = []
+    start = threading.Barrier(args.threads)
+
+    def worker(index: int) -> None:
+        headers = {"X-Worker": str(index)}
+        start.wait()
+        for number in range(args.requests):
+            tx_ref = f"tx-{index}-{number}"
+            try:
+                response = chapa.initialize(
+                    email="user@example.com", amount=100, first_name="Abebe",
+                    last_name="Bikila", tx_ref=tx_ref, headers=headers,
+                )
+                if response["status"] != "success":
+                    errors.append(f"{tx_ref}: initialize {response}")
+                response = chapa.verify(tx_ref, headers=headers)
+                if response["data"]["tx_ref"] != tx_ref:
+                    errors.append(f"{tx_ref}: got the response of {response['data']['tx_ref']}")
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(f"{tx_ref}: {error!r}")
+            if headers != {"X-Worker": str(index)}:
+                errors.append(f"{tx_ref}: caller headers modified to {headers}")
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = args.threads * args.requests * 2
+    expected = args.threads * args.requests
+    if len(emulator.transactions) != expected:
+        errors.append(f"{len(emulator.transactions)} transactions created, expected {expected}")
+    if emulator.requests != total:
+        errors.append(f"{emulator.requests} requests received, expected {total}")
+    if chapa.headers != {"Authorization": f"Bearer {SECRET}"}:
+        errors.append(f"client headers modified to {dict(chapa.headers)}")
+
+    print(f"{total} requests from {args.threads} threads in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} req/s), in flight at the end: {metrics.in_flight}")
+    for error in errors[:20]:
+        print(error)
+    return 1 if errors or metrics.in_flight else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,15 +12,160 @@ PR: https://github.com/chapimenge3/chapa/pulls
 PyPI: https://pypi.org/project/Chapa/
 """
 
-from .api import Chapa, AsyncChapa, get_testing_cards, get_testing_mobile
-from .webhook import verify_webhook, WEBHOOK_EVENTS, WEBHOOKS_EVENT_DESCRIPTION
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .api import Chapa, AsyncChapa, get_testing_cards, get_testing_mobile, pool_limits
+    from .banks import BankCache
+    from .batch import BatchResult
+    from .circuit import CircuitBreaker, CircuitOpenError
+    from .emulator import ChapaEmulator
+    from .idempotency import (
+        IdempotencyStore,
+        MemoryIdempotencyStore,
+        SQLiteIdempotencyStore,
+    )
+    from .metrics import Instrumentation, MetricsCollector, OpenTelemetryInstrumentation
+    from .models import (
+        ApiResponse,
+        Bank,
+        CheckoutSession,
+        Subaccount,
+        TransactionVerification,
+        TransferStatus,
+    )
+    from .outbox import Outbox, OutboxEntry
+    from .reconcile import Discrepancy, Reconciler, reconcile, reconcile_async
+    from .ratelimit import MemoryBackend, RateLimitBackend, RateLimiter, SQLiteBackend
+    from .retry import RetryPolicy
+    from .validation import parse_amount, validate_email, validate_many
+    from .verification import VerificationCache
+    from .watch import StatusChange
+    from .webhook import (
+        InvalidSignatureError,
+        WebhookEvent,
+        WebhookRouter,
+        verify_webhook,
+        verify_webhook_bytes,
+        WebhookVerifier,
+        WEBHOOK_EVENTS,
+        WEBHOOKS_EVENT_DESCRIPTION,
+    )
+
+
+# public name -> submodule defining it, imported on first access so that
+# ``import chapa`` stays cheap (no httpx until a client is used)
+_LAZY_ATTRIBUTES = {
+    'Chapa': 'api',
+    'AsyncChapa': 'api',
+    'get_testing_cards': 'api',
+    'get_testing_mobile': 'api',
+    'pool_limits': 'api',
+    'BankCache': 'banks',
+    'BatchResult': 'batch',
+    'CircuitBreaker': 'circuit',
+    'CircuitOpenError': 'circuit',
+    'ChapaEmulator': 'emulator',
+    'IdempotencyStore': 'idempotency',
+    'MemoryIdempotencyStore': 'idempotency',
+    'SQLiteIdempotencyStore': 'idempotency',
+    'Instrumentation': 'metrics',
+    'MetricsCollector': 'metrics',
+    'OpenTelemetryInstrumentation': 'metrics',
+    'ApiResponse': 'models',
+    'Bank': 'models',
+    'CheckoutSession': 'models',
+    'Subaccount': 'models',
+    'TransactionVerification': 'models',
+    'TransferStatus': 'models',
+    'Outbox': 'outbox',
+    'OutboxEntry': 'outbox',
+    'MemoryBackend': 'ratelimit',
+    'RateLimitBackend': 'ratelimit',
+    'RateLimiter': 'ratelimit',
+    'SQLiteBackend': 'ratelimit',
+    'RetryPolicy': 'retry',
+    'Discrepancy': 'reconcile',
+    'Reconciler': 'reconcile',
+    'reconcile': 'reconcile',
+    'reconcile_async': 'reconcile',
+    'parse_amount': 'validation',
+    'validate_email': 'validation',
+    'validate_many': 'validation',
+    'VerificationCache': 'verification',
+    'StatusChange': 'watch',
+    'InvalidSignatureError': 'webhook',
+    'WebhookEvent': 'webhook',
+    'WebhookRouter': 'webhook',
+    'verify_webhook': 'webhook',
+    'verify_webhook_bytes': 'webhook',
+    'WebhookVerifier': 'webhook',
+    'WEBHOOK_EVENTS': 'webhook',
+    'WEBHOOKS_EVENT_DESCRIPTION': 'webhook',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    submodule = importlib.import_module(f'.{module}', __name__)
+    # the reconcile submodule is callable as the function of the same name
+    value = submodule if name == module else getattr(submodule, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     'Chapa',
     'AsyncChapa',
+    'ApiResponse',
+    'Bank',
+    'BankCache',
+    'BatchResult',
+    'ChapaEmulator',
+    'CheckoutSession',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'IdempotencyStore',
+    'Instrumentation',
+    'MemoryIdempotencyStore',
+    'MetricsCollector',
+    'OpenTelemetryInstrumentation',
+    'Outbox',
+    'OutboxEntry',
+    'MemoryBackend',
+    'RateLimitBackend',
+    'RateLimiter',
+    'RetryPolicy',
+    'Discrepancy',
+    'Reconciler',
+    'reconcile',
+    'reconcile_async',
+    'SQLiteBackend',
+    'SQLiteIdempotencyStore',
+    'StatusChange',
+    'Subaccount',
+    'TransactionVerification',
+    'TransferStatus',
+    'VerificationCache',
     'get_testing_cards',
     'get_testing_mobile',
+    'pool_limits',
+    'parse_amount',
+    'validate_email',
+    'validate_many',
     'verify_webhook',
+    'verify_webhook_bytes',
+    'WebhookVerifier',
+    'InvalidSignatureError',
+    'WebhookEvent',
+    'WebhookRouter',
     'WEBHOOK_EVENTS',
     'WEBHOOKS_EVENT_DESCRIPTION'
 ]
@@ -0,0 +1,51 @@
+"""
+SQLite connection shared by the file-backed stores
+"""
+import os
+import sqlite3
+from typing import Optional, Sequence
+
+
+class SQLiteConnection:
+    """
+    Lazily opened connection to a SQLite file, reopened in forked children.
+
+    The stores serialise access with their own lock, the connection is in
+    autocommit mode so they control the transactions.
+    """
+
+    def __init__(self, path: str, timeout: float, schema: Sequence[str]):
+        """
+        Args:
+            path (str): database file, created if missing
+            timeout (float): seconds to wait for the database lock
+            schema (Sequence[str]): statements run on every new connection,
+                                    pragmas and ``CREATE ... IF NOT EXISTS``
+        """
+        self.path = path
+        self.timeout = timeout
+        self.schema = tuple(schema)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    def get(self) -> sqlite3.Connection:
+        """Return the connection of the current process, opening it if needed"""
+        # connections must not be shared with forked children
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            for statement in self.schema:
+                connection.execute(statement)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self) -> None:
+        """Close the connection, the next ``get`` opens a new one"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -5,11 +5,66 @@ API SDK for Chapa Payment Gateway
 # pylint: disable=too-few-public-methods
 # pylint: disable=too-many-branches
 # pylint: disable=too-many-arguments
-import re
 import json
-from typing import Dict, Optional
+import os
+import time
+import asyncio
+import threading
+import weakref
+from collections import ChainMap
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 import httpx
 
+from .banks import BankCache
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .validation import parse_amount, validate_email
+from .verification import TRANSACTION_TERMINAL_STATUSES, VerificationCache
+from .watch import StatusChange, watch
+from .circuit import CircuitBreaker, Permit
+from .metrics import Instrumentation, endpoint_name
+from .outbox import Outbox, OutboxEntry
+from .pagination import (
+    DEFAULT_PREFETCH,
+    PageToken,
+    iter_pages,
+    iter_pages_async,
+    page_items,
+)
+from .models import (
+    Bank,
+    CheckoutSession,
+    Model,
+    Subaccount,
+    TransactionVerification,
+    TransferStatus,
+    decode,
+)
+from .batch import (
+    DEFAULT_CONCURRENCY,
+    BatchResult,
+    Pacer,
+    run_async,
+    run_threaded,
+)
+
 
 # TODO: Implement the following methods
 # - Direct Charge
@@ -18,11 +73,248 @@ import httpx
 #   - Encryption
 
 
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+
+def pool_limits(threads: int, keepalive_expiry: float = 30.0) -> httpx.Limits:
+    """
+    Connection pool limits of a ``Chapa`` shared by ``threads`` threads
+
+    Every thread can keep its own connection alive, so busy threads never
+    wait for a connection nor reconnect.
+
+    Args:
+        threads (int): number of threads sending requests
+        keepalive_expiry (float, optional): seconds an idle connection is kept. Defaults to 30.
+
+    Returns:
+        httpx.Limits: the pool limits
+    """
+    if not isinstance(threads, int) or threads < 1:
+        raise ValueError("threads must be a positive integer")
+    return httpx.Limits(
+        max_connections=threads,
+        max_keepalive_connections=threads,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+def merge_headers(defaults: Mapping[str, str], headers: Optional[Mapping]) -> Mapping[str, str]:
+    """
+    Merge the headers of a call with the client defaults without copying either
+
+    The defaults win, as the authorization header must not be overridden.
+
+    Args:
+        defaults (Mapping): default headers of the client
+        headers (Mapping, optional): headers of the call
+
+    Returns:
+        Mapping: the merged headers
+
+    Raises:
+        ValueError: If headers is not a dict.
+    """
+    if not headers:
+        return defaults
+    if not isinstance(headers, dict):
+        raise ValueError("headers must be a dict")
+    return ChainMap(defaults, headers)
+
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+"""Timeout of interactive calls such as checkout initialization."""
+
+BATCH_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+"""Default timeout of the verify_many and transfer_many batches."""
+
+TimeoutTypes = Union[None, float, httpx.Timeout]
+
+RESPONSE_FORMATS = ("json", "obj", "model")
+
+
 class Response:
-    """Custom Response class for SMS handling."""
+    """
+    Attribute access view over the response data.
+
+    The parsed data is wrapped as is, nested dicts (and dicts inside lists)
+    are only wrapped when they are accessed.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getattr__(self, name):
+        if name == "_data" or name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            return _wrap(self._data[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __dir__(self):
+        return list(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, Response):
+            return self._data == other._data
+        return NotImplemented
 
-    def __init__(self, dict1):
-        self.__dict__.update(dict1)
+    def __repr__(self):
+        return f"Response({self._data!r})"
+
+    def to_dict(self) -> dict:
+        """Return the underlying response data"""
+        return self._data
+
+
+def _wrap(value):
+    if isinstance(value, dict):
+        return Response(value)
+    if isinstance(value, list):
+        return [_wrap(item) for item in value]
+    return value
+
+
+TRANSFER_REQUIRED_FIELDS = (
+    "account_name",
+    "account_number",
+    "amount",
+    "reference",
+    "bank_code",
+)
+TRANSFER_OPTIONAL_FIELDS = ("beneficiary_name", "currency", "validate_bank_code")
+TRANSFER_TERMINAL_STATUSES = frozenset({"success", "failed", "reversed", "cancelled"})
+
+
+def get_field(response: Any, name: str) -> Any:
+    """Read a field from a 'json' or 'obj' formatted response"""
+    if isinstance(response, dict):
+        return response.get(name)
+    return getattr(response, name, None)
+
+
+def validate_transfers(transfers: Iterable[dict]) -> List[dict]:
+    """
+    Validate transfer specs before any of them is submitted
+
+    Args:
+        transfers (Iterable[dict]): keyword arguments of ``transfer_to_bank``
+
+    Returns:
+        List[dict]: the validated specs, ready to be passed to ``transfer_to_bank``
+
+    Raises:
+        ValueError: if a spec is malformed or a reference is repeated.
+    """
+    specs = []
+    seen = set()
+    allowed = set(TRANSFER_REQUIRED_FIELDS + TRANSFER_OPTIONAL_FIELDS)
+    for index, transfer in enumerate(transfers):
+        if not isinstance(transfer, dict):
+            raise ValueError(f"transfer #{index} must be a dict")
+
+        missing = [name for name in TRANSFER_REQUIRED_FIELDS if not transfer.get(name)]
+        if missing:
+            raise ValueError(f"transfer #{index} is missing {', '.join(missing)}")
+
+        unknown = set(transfer) - allowed
+        if unknown:
+            raise ValueError(f"transfer #{index} has unknown fields {', '.join(sorted(unknown))}")
+
+        try:
+            parse_amount(transfer["amount"])
+        except ValueError:
+            raise ValueError(f"transfer #{index} has an invalid amount") from None
+
+        reference = transfer["reference"]
+        if reference in seen:
+            raise ValueError(f"duplicate transfer reference {reference}")
+        seen.add(reference)
+
+        specs.append({"beneficiary_name": None, **transfer})
+
+    return specs
+
+
+def data_status(response: Any) -> Optional[str]:
+    """Read the lowercased ``data.status`` of a verify or verify_transfer response"""
+    status = get_field(get_field(response, "data"), "status")
+    return str(status).lower() if status else None
+
+
+def is_not_found(response: Any) -> bool:
+    """True if a failed verify or verify_transfer response says the reference is unknown"""
+    return "not found" in str(get_field(response, "message") or "").lower()
+
+
+# submission failures after which the request may still have reached Chapa
+_UNKNOWN_OUTCOME_ERRORS = (httpx.TransportError, json.JSONDecodeError, UnicodeDecodeError)
+
+
+def _verify_result(tx_ref: str, response: Any) -> BatchResult:
+    """Result of a verified transaction, its status is 'failed' if Chapa refused the request"""
+    if get_field(response, "status") != "success":
+        return BatchResult(tx_ref, response=response, status="failed")
+    return BatchResult(tx_ref, response=response, status=data_status(response))
+
+
+def _transfer_result(reference: str, response: Any) -> Optional[BatchResult]:
+    """Return the final result of a verified transfer, None while pending"""
+    status = data_status(response)
+    if status in TRANSFER_TERMINAL_STATUSES:
+        return BatchResult(reference, response=response, status=status)
+    return None
+
+
+def _submit_result(response: Any) -> str:
+    """Outbox result of an answered initialize or transfer request"""
+    return "accepted" if get_field(response, "status") == "success" else "rejected"
+
+
+def _replay_result(response: Any) -> Optional[str]:
+    """Outbox result of a verified entry, None while the outcome is still unknown"""
+    if get_field(response, "status") == "success":
+        return data_status(response) or "accepted"
+    if is_not_found(response):
+        return "not_found"
+    return None
+
+
+def _flushing(results: Iterator[BatchResult], outbox: Outbox) -> Iterator[BatchResult]:
+    try:
+        yield from results
+    finally:
+        outbox.flush()
+
+
+async def _flushing_async(
+    results: AsyncIterator[BatchResult], outbox: Outbox
+) -> AsyncIterator[BatchResult]:
+    try:
+        async for result in results:
+            yield result
+    finally:
+        await outbox.flush_async()
+
+
+# clients whose HTTP connections must not be reused by a forked child process
+_CLIENT_OWNERS = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for owner in list(_CLIENT_OWNERS):
+        owner._after_fork()  # pylint: disable=protected-access
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
 def convert_response(response: dict) -> Response:
@@ -38,12 +330,89 @@ def convert_response(response: dict) -> Response:
     if not isinstance(response, dict):
         return response
 
-    return json.loads(json.dumps(response), object_hook=Response)
+    return Response(response)
+
+
+def decode_response(response: httpx.Response):
+    """
+    Parse the response body straight from its bytes
 
+    Args:
+        response (httpx.Response): the response to decode
 
-class Chapa:
+    Returns:
+        The parsed JSON data
+    """
+    return json.loads(response.content)
+
+
+class _ChapaBase:
+    """Helpers shared by ``Chapa`` and ``AsyncChapa``"""
+
+    def _record_outcome(
+        self,
+        method: str,
+        endpoint: Optional[str],
+        started: float,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+        permit: Optional[Permit] = None,
+    ) -> None:
+        """Report the outcome of a request attempt to the circuit breaker and instrumentation"""
+        duration = time.monotonic() - started
+        if self.circuit_breaker and (error is None or isinstance(error, httpx.TransportError)):
+            self.circuit_breaker.record(
+                error is None and response.status_code < 500, duration, permit
+            )
+        if self.instrumentation:
+            if error is not None:
+                self.instrumentation.on_request_error(method, endpoint, error, duration)
+            else:
+                self.instrumentation.on_request_end(
+                    method,
+                    endpoint,
+                    response.status_code,
+                    duration,
+                    len(response.request.content),
+                    len(response.content),
+                )
+
+    def _format(self, res, model: Optional[Type[Model]] = None):
+        """Convert raw response data to the configured response format
+
+        Args:
+            res: raw response data
+            model (Type[Model], optional): model of the data for the 'model' format
+        """
+        if self.response_format == "obj" and isinstance(res, dict):
+            return convert_response(res)
+        if self.response_format == "model":
+            return decode(res, model)
+
+        return res
+
+    def _format_item(self, item, model: Type[Model]):
+        """Convert an item of a list page to the configured response format"""
+        if not isinstance(item, dict) or self.response_format == "json":
+            return item
+        if self.response_format == "obj":
+            return Response(item)
+        return model.from_dict(item)
+
+    def _page_url(self, url: str) -> str:
+        """Check that a next page url points to the api before following it"""
+        if not url.startswith(f"{self.base_url}/"):
+            raise ValueError(f"unexpected next page url {url}")
+        return url
+
+
+class Chapa(_ChapaBase):
     """
     Simple SDK for Chapa Payment gateway
+
+    An instance is thread-safe: share a single one between the threads of a
+    worker so they use the same connection pool, sized with ``limits`` (see
+    ``pool_limits``).
     """
 
     def __init__(
@@ -52,19 +421,121 @@ class Chapa:
         base_ur="https://api.chapa.co",
         api_version="v1",
         response_format="json",
+        *,
+        limits: Optional[httpx.Limits] = None,
+        bank_cache: Optional[BankCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeout: TimeoutTypes = DEFAULT_TIMEOUT,
+        verification_cache: Optional[VerificationCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        outbox: Optional[Outbox] = None,
     ):
+        """
+        Args:
+            secret (str): Chapa secret key.
+            base_ur (str, optional): base url of the api. Defaults to "https://api.chapa.co".
+            api_version (str, optional): api version. Defaults to "v1".
+            response_format (str, optional): 'json', 'obj' or 'model'. Defaults to "json".
+            limits (httpx.Limits, optional): connection pool limits, see ``pool_limits``.
+                                             Defaults to DEFAULT_LIMITS.
+            bank_cache (BankCache, optional): cache of the bank list, may be shared between
+                                              instances. Defaults to a one hour cache.
+            retry (RetryPolicy, optional): retry policy for transient failures. Defaults to
+                                           3 attempts of idempotent requests.
+            rate_limiter (RateLimiter, optional): client-side rate limiter, may be shared
+                                                  between instances. Defaults to None.
+            circuit_breaker (CircuitBreaker, optional): fail fast while the API is degraded,
+                                                        may be shared between instances.
+                                                        Defaults to None.
+            timeout (float | httpx.Timeout, optional): default connect/read/write/pool
+                                                       timeouts. Defaults to DEFAULT_TIMEOUT.
+            verification_cache (VerificationCache, optional): cache of transactions in a final
+                                                              status, answering verify without
+                                                              a request. Defaults to None.
+            instrumentation (Instrumentation, optional): hooks called around every request,
+                                                         e.g. a MetricsCollector. Defaults to None.
+            outbox (Outbox, optional): journal of the initialize and transfer calls, replayed
+                                       with ``replay_outbox`` after a crash. Defaults to None.
+        """
         self._key = secret
         self.base_url = base_ur
         self.api_version = api_version
-        if response_format and response_format in ["json", "obj"]:
+        if response_format and response_format in RESPONSE_FORMATS:
             self.response_format = response_format
         else:
-            raise ValueError("response_format must be 'json' or 'obj'")
-
-        self.headers = {"Authorization": f"Bearer {self._key}"}
-        self.client = httpx.Client()
+            raise ValueError("response_format must be 'json', 'obj' or 'model'")
+
+        self.headers = MappingProxyType({"Authorization": f"Bearer {self._key}"})
+        self.timeout = timeout
+        self.limits = limits or DEFAULT_LIMITS
+        self._client: Optional[httpx.Client] = None
+        self._owns_client = True
+        self._client_pid: Optional[int] = None
+        self._client_lock = threading.Lock()
+        _CLIENT_OWNERS.add(self)
+        self.bank_cache = bank_cache or BankCache()
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.verification_cache = verification_cache
+        self.instrumentation = instrumentation
+        if instrumentation:
+            instrumentation.attach(self)
+        self.outbox = outbox
+
+    @property
+    def client(self) -> httpx.Client:
+        """
+        HTTP client, created on first use and again in a forked child process
 
-    def send_request(self, url, method, data=None, params=None, headers=None):
+        A client assigned by the user is kept as is, even after a fork.
+        """
+        client = self._client
+        if client is None or (self._owns_client and self._client_pid != os.getpid()):
+            with self._client_lock:
+                if self._client is None or self._client_pid != os.getpid():
+                    if self._owns_client:
+                        self._client = httpx.Client(limits=self.limits, timeout=self.timeout)
+                        self._client_pid = os.getpid()
+                client = self._client
+        return client
+
+    @client.setter
+    def client(self, client: Optional[httpx.Client]) -> None:
+        self._client = client
+        self._owns_client = client is None
+        self._client_pid = os.getpid()
+
+    @property
+    def clients(self) -> List[httpx.Client]:
+        """HTTP clients created so far, without creating one"""
+        return [self._client] if self._client is not None else []
+
+    def _after_fork(self) -> None:
+        """Drop the connections inherited from the parent process"""
+        self._client_lock = threading.Lock()
+        if self._owns_client:
+            # not closed: the parent process still uses the sockets
+            self._client = None
+
+    def close(self) -> None:
+        """Close the underlying connection pool"""
+        if self._client is not None:
+            self._client.close()
+            if self._owns_client:
+                self._client = None
+
+    def __enter__(self) -> "Chapa":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def send_request(
+        self, url, method, data=None, params=None, headers=None, timeout: TimeoutTypes = None
+    ):
         """
         Request sender to the api
 
@@ -72,35 +543,110 @@ class Chapa:
             url (str): url for the request to be sent.
             method (str): the method for the request.
             data (dict, optional): request body. Defaults to None.
+            headers (dict, optional): headers of the request, added to the client
+                                      headers without modifying them. Defaults to None.
+            timeout (float | httpx.Timeout, optional): overrides the client timeout.
+                                                       Defaults to None.
 
         Returns:
             response: response of the server.
         """
+        return decode_response(
+            self._request(url, method, data=data, params=params, headers=headers, timeout=timeout)
+        )
+
+    def _request(
+        self, url, method, data=None, params=None, headers=None, timeout: TimeoutTypes = None
+    ) -> httpx.Response:
+        """Validate the arguments of ``send_request`` and send it"""
         if params and not isinstance(params, dict):
             raise ValueError("params must be a dict")
 
         if data and not isinstance(data, dict):
             raise ValueError("data must be a dict")
 
-        if headers and isinstance(data, dict):
-            headers.update(self.headers)
-        elif headers and not isinstance(data, dict):
-            raise ValueError("headers must be a dict")
-        else:
-            headers = self.headers
+        headers = merge_headers(self.headers, headers)
 
-        func = getattr(self.client, method)
-        response = func(url, data=data, headers=headers)
-        return getattr(response, "json", lambda: response.text)()
+        return self._send(
+            method.upper(), url, data=data, params=params, headers=headers, timeout=timeout
+        )
 
-    def _construct_request(self, *args, **kwargs):
+    def _send(
+        self, method, url, data=None, params=None, headers=None, timeout: TimeoutTypes = None
+    ) -> httpx.Response:
+        """Send the request, retrying transient failures according to ``self.retry``"""
+        retryable = self.retry.allows(method, data)
+        if timeout is None:
+            timeout = httpx.USE_CLIENT_DEFAULT
+        endpoint = endpoint_name(url) if self.instrumentation else None
+        attempt = 0
+        breaker = self.circuit_breaker
+        while True:
+            permit = breaker.before_request() if breaker else None
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(url)
+                if self.instrumentation:
+                    self.instrumentation.on_request_start(method, endpoint)
+                started = time.monotonic()
+                try:
+                    response = self.client.request(
+                        method, url, data=data, params=params, headers=headers, timeout=timeout
+                    )
+                except httpx.TransportError as error:
+                    self._record_outcome(method, endpoint, started, error=error, permit=permit)
+                    delay = self.retry.next_delay(attempt, error=error) if retryable else None
+                    if delay is None:
+                        raise
+                except BaseException as error:
+                    # cancellations and caller errors say nothing about the API health
+                    self._record_outcome(method, endpoint, started, error=error, permit=permit)
+                    raise
+                else:
+                    self._record_outcome(
+                        method, endpoint, started, response=response, permit=permit
+                    )
+                    delay = (
+                        self.retry.next_delay(attempt, response=response) if retryable else None
+                    )
+                    if delay is None:
+                        return response
+            finally:
+                if permit is not None:
+                    breaker.release(permit)
+            if self.instrumentation:
+                self.instrumentation.on_retry(method, endpoint, attempt + 1, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _construct_request(
+        self, *args, model: Optional[Type[Model]] = None, **kwargs
+    ):
         """Construct the request to send to the API"""
 
         res = self.send_request(*args, **kwargs)
-        if self.response_format == "obj" and isinstance(res, dict):
-            return convert_response(res)
+        return self._format(res, model)
 
-        return res
+    def _submit(
+        self, kind: str, reference: str, *args, model: Optional[Type[Model]] = None, **kwargs
+    ):
+        """Send an initialize or transfer request, journaled in ``self.outbox`` when set"""
+        _, res = self._submit_raw(kind, reference, *args, **kwargs)
+        return self._format(res, model)
+
+    def _submit_raw(
+        self, kind: str, reference: str, *args, **kwargs
+    ) -> Tuple[httpx.Response, Any]:
+        """``_submit`` returning the HTTP response and its raw decoded body"""
+        outbox = self.outbox
+        if outbox is not None:
+            outbox.record(kind, reference, kwargs["data"])
+        response = self._request(*args, **kwargs)
+        res = decode_response(response)
+        # after a server error the outcome is unknown, the entry is verified on replay
+        if outbox is not None and response.status_code < 500:
+            outbox.complete(kind, reference, _submit_result(res))
+        return response, res
 
     def initialize(
         self,
@@ -115,6 +661,7 @@ class Chapa:
         return_url=None,
         customization=None,
         headers=None,
+        timeout: TimeoutTypes = None,
         **kwargs,
     ) -> dict | Response:
         """
@@ -136,6 +683,7 @@ class Chapa:
             customization (dict, optional): customization, currently 'title' and 'description'
                                             are available. Defaults to None.
             headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
 
         Return:
             dict: response from the server
@@ -152,21 +700,10 @@ class Chapa:
         if kwargs:
             data.update(kwargs)
 
-        if not isinstance(amount, int):
-            if str(amount).replace(".", "", 1).isdigit() and float(amount) > 0:
-                pass
-            else:
-                raise ValueError("invalid amount")
-        elif isinstance(amount, int):
-            if amount < 0:
-                raise ValueError("invalid amount")
-
+        parse_amount(amount)
         data["amount"] = amount
 
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-            raise ValueError("invalid email")
-
-        data["email"] = email
+        data["email"] = validate_email(email)
 
         if phone_number:
             data["phone_number"] = phone_number
@@ -185,30 +722,80 @@ class Chapa:
             if "logo" in customization:
                 data["customization[logo]"] = customization["logo"]
 
-        response = self._construct_request(
+        response = self._submit(
+            "transaction",
+            tx_ref,
             url=f"{self.base_url}/{self.api_version}/transaction/initialize",
+            model=CheckoutSession,
             method="post",
             data=data,
             headers=headers,
+            timeout=timeout,
         )
         return response
 
-    def verify(self, transaction: str, headers=None) -> dict | Response:
+    def verify(
+        self, transaction: str, headers=None, timeout: TimeoutTypes = None
+    ) -> dict | Response:
         """Verify the transaction
 
         Args:
             transaction (str): transaction id
+            headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
+
+        Transactions in a final status are answered from ``verification_cache`` when it is set.
 
         Response:
             dict: response from the server
             response(Response): response object of the response data return from the Chapa server.
         """
-        response = self._construct_request(
+        cache = self.verification_cache
+        if cache is not None:
+            cached = cache.get(transaction)
+            if cached is not None:
+                return self._format(cached, TransactionVerification)
+
+        res = self.send_request(
             url=f"{self.base_url}/{self.api_version}/transaction/verify/{transaction}",
             method="get",
             headers=headers,
+            timeout=timeout,
+        )
+        if cache is not None:
+            cache.put(transaction, res)
+        return self._format(res, TransactionVerification)
+
+    def verify_many(
+        self,
+        tx_refs: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        headers=None,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> Iterator[BatchResult]:
+        """Verify many transactions in parallel on a thread pool
+
+        Failures are reported per reference instead of aborting the batch.
+
+        Args:
+            tx_refs (Iterable[str]): transaction ids to verify
+            concurrency (int, optional): maximum parallel requests. Defaults to 10.
+            headers(dict, optional): header to attach on the requests. Default to None
+            timeout(float | httpx.Timeout, optional): timeout of each request. Default to BATCH_TIMEOUT
+
+        Yields:
+            BatchResult: reference, response and error of each verification,
+                         in completion order. ``status`` is the transaction
+                         status ('failed' if Chapa refused the request) and
+                         ``ok`` is False when the request or the payment failed.
+        """
+        return run_threaded(
+            lambda tx_ref: _verify_result(
+                tx_ref, self.verify(tx_ref, headers=headers, timeout=timeout)
+            ),
+            tx_refs,
+            concurrency,
         )
-        return response
 
     def create_subaccount(
         self,
@@ -219,6 +806,7 @@ class Chapa:
         split_value: str,
         split_type: str,
         headers=None,
+        timeout: TimeoutTypes = None,
         **kwargs,
     ) -> dict | Response:
         """
@@ -232,6 +820,7 @@ class Chapa:
             split_value (str): split value
             split_type (str): split type
             headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
             **kwargs: additional data to be sent to the server
 
         Return:
@@ -253,9 +842,11 @@ class Chapa:
 
         response = self._construct_request(
             url=f"{self.base_url}/{self.api_version}/subaccount",
+            model=Subaccount,
             method="post",
             data=data,
             headers=headers,
+            timeout=timeout,
         )
         return response
 
@@ -271,6 +862,7 @@ class Chapa:
         return_url: str,
         subaccount_id: str,
         headers=None,
+        timeout: TimeoutTypes = None,
         **kwargs,
     ) -> dict | Response:
         """
@@ -290,6 +882,7 @@ class Chapa:
             subaccount_id (str, optional): subaccount id to split payment.
                                           Defaults to None.
             headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
             **kwargs: additional data to be sent to the server
 
         Return:
@@ -310,43 +903,72 @@ class Chapa:
         if kwargs:
             data.update(kwargs)
 
-        if not isinstance(amount, int):
-            if str(amount).replace(".", "", 1).isdigit() and float(amount) > 0:
-                pass
-            else:
-                raise ValueError("invalid amount")
-        elif isinstance(amount, int):
-            if amount < 0:
-                raise ValueError("invalid amount")
-
+        parse_amount(amount)
         data["amount"] = amount
 
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-            raise ValueError("invalid email")
-
-        data["email"] = email
+        data["email"] = validate_email(email)
 
-        response = self._construct_request(
+        response = self._submit(
+            "transaction",
+            tx_ref,
             url=f"{self.base_url}/{self.api_version}/transaction/initialize",
+            model=CheckoutSession,
             method="post",
             data=data,
             headers=headers,
+            timeout=timeout,
         )
         return response
 
-    def get_banks(self, headers=None) -> dict | Response:
+    def get_banks(
+        self, headers=None, refresh=False, timeout: TimeoutTypes = None
+    ) -> dict | Response:
         """Get the list of all banks
 
+        The list is served from ``bank_cache`` while it is fresh (one hour
+        by default). A call with ``headers`` always sends the request and
+        leaves the cache untouched.
+
+        Args:
+            headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
+            refresh(bool, optional): ignore the cached list. Default to False
+
         Response:
             dict: response from the server
             response(Response): response object of the response data return from the Chapa server.
         """
-        response = self._construct_request(
-            url=f"{self.base_url}/{self.api_version}/banks",
-            method="get",
-            headers=headers,
-        )
-        return response
+
+        def fetch():
+            return self.send_request(
+                url=f"{self.base_url}/{self.api_version}/banks",
+                method="get",
+                headers=headers,
+                timeout=timeout,
+            )
+
+        if headers:
+            return self._format(fetch(), Bank)
+        if refresh:
+            self.bank_cache.invalidate()
+
+        res = self.bank_cache.get(fetch)
+        return self._format(res, Bank)
+
+    def find_bank(self, bank) -> Optional[dict]:
+        """Find a bank by id, slug, swift code or name
+
+        The bank list is only fetched when the cache is stale, lookups are
+        otherwise served from the in-memory index.
+
+        Args:
+            bank: bank id (the bank_code of transfers), slug, swift code or name
+
+        Returns:
+            dict: the bank, None if it does not exist
+        """
+        self.get_banks()
+        return self.bank_cache.lookup(bank)
 
     def transfer_to_bank(
         self,
@@ -358,6 +980,8 @@ class Chapa:
         beneficiary_name: Optional[str],
         bank_code: str,
         currency: str = "ETB",
+        validate_bank_code: bool = False,
+        timeout: TimeoutTypes = None,
     ) -> dict | Response:
         """Initiate a Bank Transfer
 
@@ -371,36 +995,69 @@ class Chapa:
             currency (float): This is the currency for the Transfer. Expected value is ETB.  Default value is ETB.
             reference (str): This a merchant’s uniques reference for the transfer, it can be used to query for the status of the transfer
             bank_code (str): This is the recipient bank code. You can see a list of all the available banks and their codes from the get banks endpoint.
+            validate_bank_code (bool, optional): check bank_code against the ids of the cached bank list before sending. Defaults to False.
+            timeout (float | httpx.Timeout, optional): request timeout, overrides the client timeout. Defaults to None.
 
         Returns:
             dict: response from the server
             response(Response): response object of the response data return from the Chapa server.
         """
+        _, res = self._transfer(
+            {
+                "account_name": account_name,
+                "account_number": account_number,
+                "amount": amount,
+                "reference": reference,
+                "beneficiary_name": beneficiary_name,
+                "bank_code": bank_code,
+                "currency": currency,
+                "validate_bank_code": validate_bank_code,
+            },
+            timeout=timeout,
+        )
+        return self._format(res)
+
+    def _transfer(
+        self, spec: Dict[str, Any], timeout: TimeoutTypes = None
+    ) -> Tuple[httpx.Response, Any]:
+        """Send a transfer spec (keyword arguments of ``transfer_to_bank``), unformatted"""
+        bank_code = spec["bank_code"]
+        if spec.get("validate_bank_code"):
+            self.get_banks()
+            if self.bank_cache.lookup_code(bank_code) is None:
+                raise ValueError("invalid bank_code")
+
+        reference = spec["reference"]
         data = {
-            "account_name": account_name,
-            "account_number": account_number,
-            "amount": amount,
+            "account_name": spec["account_name"],
+            "account_number": spec["account_number"],
+            "amount": spec["amount"],
             "reference": reference,
             "bank_code": bank_code,
-            "currency": currency,
+            "currency": spec.get("currency", "ETB"),
         }
-        if beneficiary_name:
-            data["beneficiary_name"] = beneficiary_name
+        if spec.get("beneficiary_name"):
+            data["beneficiary_name"] = spec["beneficiary_name"]
 
-        response = self._construct_request(
+        return self._submit_raw(
+            "transfer",
+            reference,
             url=f"{self.base_url}/{self.api_version}/transfer",
             method="post",
             data=data,
+            timeout=timeout,
         )
-        return response
 
-    def verify_transfer(self, reference: str) -> dict | Response:
+    def verify_transfer(
+        self, reference: str, timeout: TimeoutTypes = None
+    ) -> dict | Response:
         """Verify the status of a transfer
 
         This section describes how to verify the status of a transfer with Chapa
 
         Args:
             reference (str): This a merchant’s uniques reference for the transfer, it can be used to query for the status of the transfer
+            timeout (float | httpx.Timeout, optional): request timeout, overrides the client timeout. Defaults to None.
 
         Returns:
             dict: response from the server
@@ -411,29 +1068,384 @@ class Chapa:
         """
         response = self._construct_request(
             url=f"{self.base_url}/{self.api_version}/transfer/verify/{reference}",
+            model=TransferStatus,
             method="get",
+            timeout=timeout,
         )
         return response
 
+    def transfer_many(
+        self,
+        transfers: Iterable[dict],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: Optional[float] = None,
+        poll_interval: float = 2.0,
+        max_polls: int = 10,
+        submitted: Optional[Iterable[str]] = None,
+        on_submit: Optional[Callable[[str], None]] = None,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> Iterator[BatchResult]:
+        """Submit many bank transfers and follow each one up to its final status
+
+        Every spec is validated before anything is sent. Each transfer is then
+        submitted with ``transfer_to_bank`` and polled with ``verify_transfer``
+        until it reaches a terminal status.
+
+        To resume a partially completed batch, pass the references recorded
+        through ``on_submit`` as ``submitted``. ``on_submit`` is called before
+        each transfer is sent, so a recorded reference may or may not have
+        reached Chapa: it is verified first and only sent if Chapa does not
+        know it. A submission whose outcome is unknown (a transport error such
+        as a timeout after Chapa received it, a 5xx response or an undecodable
+        body) is verified and polled like the others; only a 4xx refusal is
+        reported as 'rejected'.
+
+        Args:
+            transfers (Iterable[dict]): keyword arguments of ``transfer_to_bank``
+            concurrency (int, optional): maximum transfers processed in parallel. Defaults to 10.
+            rate (float, optional): maximum submissions per second. Defaults to no limit.
+            poll_interval (float, optional): seconds between two verifications. Defaults to 2.0.
+            max_polls (int, optional): verifications before giving up with a 'pending'
+                                       status. Defaults to 10.
+            submitted (Iterable[str], optional): references possibly submitted by a
+                                                 previous run, verified before sending.
+            on_submit (Callable, optional): called with each reference before it is sent.
+            timeout (float | httpx.Timeout, optional): timeout of each request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            BatchResult: one result per reference, in completion order. ``status``
+                         is the final transfer status, 'rejected' if the
+                         submission was refused or 'pending' if polling gave up.
+
+        Raises:
+            ValueError: If a transfer spec is invalid.
+        """
+        specs = validate_transfers(transfers)
+        submitted = set(submitted or ())
+        pacer = Pacer(rate)
+
+        def process(spec):
+            reference = spec["reference"]
+            response = None
+            if reference in submitted:
+                response = self.verify_transfer(reference, timeout=timeout)
+                result = _transfer_result(reference, response)
+                if result:
+                    return result
+            if reference not in submitted or is_not_found(response):
+                if on_submit:
+                    on_submit(reference)
+                pacer.wait()
+                try:
+                    sent, body = self._transfer(spec, timeout=timeout)
+                except _UNKNOWN_OUTCOME_ERRORS:
+                    # Chapa may have received the transfer before the failure
+                    if is_not_found(self.verify_transfer(reference, timeout=timeout)):
+                        raise
+                else:
+                    # after a server error the outcome is unknown, the polls tell
+                    if sent.status_code < 500 and get_field(body, "status") != "success":
+                        return BatchResult(
+                            reference, response=self._format(body), status="rejected"
+                        )
+
+            for attempt in range(max_polls):
+                if attempt:
+                    time.sleep(poll_interval)
+                response = self.verify_transfer(reference, timeout=timeout)
+                result = _transfer_result(reference, response)
+                if result:
+                    return result
+            return BatchResult(reference, response=response, status="pending")
+
+        return run_threaded(process, specs, concurrency, key=itemgetter("reference"))
+
+    def iter_transactions(
+        self,
+        params: Optional[Dict] = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> Iterator[Any]:
+        """Iterate over every transaction of the account, page after page
+
+        The pages are requested lazily; while a page is consumed the next one
+        is fetched in the background, and at most ``prefetch`` pages wait in
+        memory, so arbitrarily long histories are streamed in constant memory.
+
+        Args:
+            params (dict, optional): filters of the list endpoint. Defaults to None.
+            prefetch (int, optional): pages fetched ahead. Defaults to 1.
+            timeout (float | httpx.Timeout, optional): timeout of each page request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            dict | Response | TransactionVerification: every transaction
+
+        Raises:
+            ValueError: If a page request is refused.
+        """
+        return self._iter_list("transactions", "transactions", TransactionVerification,
+                               params, prefetch, timeout)
+
+    def iter_transfers(
+        self,
+        params: Optional[Dict] = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> Iterator[Any]:
+        """Iterate over every transfer of the account, page after page
+
+        Same as ``iter_transactions`` for transfers.
+
+        Args:
+            params (dict, optional): filters of the list endpoint. Defaults to None.
+            prefetch (int, optional): pages fetched ahead. Defaults to 1.
+            timeout (float | httpx.Timeout, optional): timeout of each page request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            dict | Response | TransferStatus: every transfer
+
+        Raises:
+            ValueError: If a page request is refused.
+        """
+        return self._iter_list("transfers", "transfers", TransferStatus, params, prefetch, timeout)
+
+    def _iter_list(self, path, key, model, params, prefetch, timeout) -> Iterator[Any]:
+        url = f"{self.base_url}/{self.api_version}/{path}"
+
+        def fetch(token: PageToken):
+            if isinstance(token, str):
+                response = self.send_request(self._page_url(token), "get", timeout=timeout)
+            else:
+                response = self.send_request(
+                    url, "get", params={**(params or {}), "page": token}, timeout=timeout
+                )
+            if get_field(response, "status") != "success":
+                raise ValueError(f"cannot list {path}: {get_field(response, 'message')}")
+            return response
+
+        for page in iter_pages(fetch, key, prefetch):
+            for item in page_items(page, key):
+                yield self._format_item(item, model)
+
+    def replay_outbox(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> Iterator[BatchResult]:
+        """Verify the journaled calls whose outcome is unknown, e.g. after a crash
+
+        Every unresolved ``outbox`` entry is verified with ``verify`` or
+        ``verify_transfer`` and resolved with the verified status, or
+        'not_found' if Chapa never received it. Nothing is sent again.
+
+        Args:
+            concurrency (int, optional): maximum parallel verifications. Defaults to 10.
+            timeout (float | httpx.Timeout, optional): timeout of each request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            BatchResult: one result per unresolved entry, in completion order. ``status``
+                         is None when the outcome is still unknown.
+
+        Raises:
+            ValueError: If the client has no outbox.
+        """
+        outbox = self.outbox
+        if outbox is None:
+            raise ValueError("replay_outbox requires an outbox")
+
+        def resolve(entry: OutboxEntry) -> BatchResult:
+            if entry.kind == "transfer":
+                response = self.verify_transfer(entry.reference, timeout=timeout)
+            else:
+                response = self.verify(entry.reference, timeout=timeout)
+            status = _replay_result(response)
+            if status:
+                outbox.complete(entry.kind, entry.reference, status)
+            return BatchResult(entry.reference, response=response, status=status)
+
+        results = run_threaded(
+            resolve, outbox.unresolved(), concurrency, key=attrgetter("reference")
+        )
+        return _flushing(results, outbox)
+
+
+class _NoLoop:
+    """Key of the client used outside of a running event loop"""
+
+
+_NO_LOOP = _NoLoop()
+
+
+class AsyncChapa(_ChapaBase):
+    """
+    Async SDK for Chapa Payment gateway
+
+    A single ``httpx.AsyncClient`` is kept open for the lifetime of the instance
+    so connections to the Chapa API are pooled and reused between requests. Use
+    the instance as an async context manager or call ``aclose`` when done.
+
+    Example:
+        async with AsyncChapa("secret") as chapa:
+            await chapa.verify("tx-ref")
+    """
 
-class AsyncChapa:
     def __init__(
         self,
         secret: str,
         base_ur: str = "https://api.chapa.co",
         api_version: str = "v1",
         response_format: str = "json",
+        *,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        bank_cache: Optional[BankCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeout: TimeoutTypes = DEFAULT_TIMEOUT,
+        verification_cache: Optional[VerificationCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        outbox: Optional[Outbox] = None,
     ) -> None:
+        """
+        Args:
+            secret (str): Chapa secret key.
+            base_ur (str, optional): base url of the api. Defaults to "https://api.chapa.co".
+            api_version (str, optional): api version. Defaults to "v1".
+            response_format (str, optional): 'json', 'obj' or 'model'. Defaults to "json".
+            limits (httpx.Limits, optional): connection pool limits (max connections,
+                                             keepalive expiry...). Defaults to DEFAULT_LIMITS.
+            http2 (bool, optional): enable HTTP/2, requires ``httpx[http2]``. Defaults to False.
+            bank_cache (BankCache, optional): cache of the bank list, may be shared between
+                                              instances. Defaults to a one hour cache.
+            retry (RetryPolicy, optional): retry policy for transient failures. Defaults to
+                                           3 attempts of idempotent requests.
+            rate_limiter (RateLimiter, optional): client-side rate limiter, may be shared
+                                                  between instances. Defaults to None.
+            circuit_breaker (CircuitBreaker, optional): fail fast while the API is degraded,
+                                                        may be shared between instances.
+                                                        Defaults to None.
+            timeout (float | httpx.Timeout, optional): default connect/read/write/pool
+                                                       timeouts. Defaults to DEFAULT_TIMEOUT.
+            verification_cache (VerificationCache, optional): cache of transactions in a final
+                                                              status, answering verify without
+                                                              a request. Defaults to None.
+            instrumentation (Instrumentation, optional): hooks called around every request,
+                                                         e.g. a MetricsCollector. Defaults to None.
+            outbox (Outbox, optional): journal of the initialize and transfer calls, replayed
+                                       with ``replay_outbox`` after a crash. Defaults to None.
+        """
         self._key = secret
         self.base_url = base_ur
         self.api_version = api_version
-        if response_format and response_format in ["json", "obj"]:
+        if response_format and response_format in RESPONSE_FORMATS:
             self.response_format = response_format
         else:
-            raise ValueError("response_format must be 'json' or 'obj'")
+            raise ValueError("response_format must be 'json', 'obj' or 'model'")
+
+        self.headers = MappingProxyType({"Authorization": f"Bearer {self._key}"})
+        self.limits = limits or DEFAULT_LIMITS
+        self.http2 = http2
+        self.timeout = timeout
+        # a client assigned by the user is shared by every event loop, otherwise
+        # each event loop gets its own pool, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        self._clients: "weakref.WeakKeyDictionary[Any, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._clients_pid = os.getpid()
+        self._clients_lock = threading.Lock()
+        _CLIENT_OWNERS.add(self)
+        self.bank_cache = bank_cache or BankCache()
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.verification_cache = verification_cache
+        self.instrumentation = instrumentation
+        if instrumentation:
+            instrumentation.attach(self)
+        self.outbox = outbox
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        HTTP client of the running event loop
+
+        Connections are bound to the event loop that opened them, so every
+        event loop gets its own pool, created on first use. The pools are
+        dropped in a forked child process. A client assigned by the user is
+        used by every event loop.
+        """
+        if self._client is not None:
+            return self._client
+        if self._clients_pid != os.getpid():
+            self._after_fork()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = _NO_LOOP
+        client = self._clients.get(loop)
+        if client is None:
+            with self._clients_lock:
+                client = self._clients.get(loop)
+                if client is None:
+                    client = self._clients[loop] = httpx.AsyncClient(
+                        limits=self.limits, http2=self.http2, timeout=self.timeout
+                    )
+        return client
+
+    @client.setter
+    def client(self, client: Optional[httpx.AsyncClient]) -> None:
+        self._client = client
+
+    @property
+    def clients(self) -> List[httpx.AsyncClient]:
+        """HTTP clients created so far, without creating one"""
+        if self._client is not None:
+            return [self._client]
+        return list(self._clients.values())
+
+    def _after_fork(self) -> None:
+        """Drop the connections and requests inherited from the parent process"""
+        self._clients_lock = threading.Lock()
+        # not closed: the parent process still uses the sockets
+        self._clients = weakref.WeakKeyDictionary()
+        self._clients_pid = os.getpid()
+        self._inflight.clear()
+
+    async def __aenter__(self) -> "AsyncChapa":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the connection pools
 
-        self.headers = {"Authorization": f"Bearer {self._key}"}
-        self.client = httpx.AsyncClient()
+        The pools of the running event loop and the one created outside of
+        any event loop are closed. The pools of other running event loops are
+        closed on their own loop, without waiting. An event loop that stopped
+        can no longer close its pool, which is only dropped: call ``aclose``
+        from each event loop before it stops.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            return
+        current = asyncio.get_running_loop()
+        with self._clients_lock:
+            clients = list(self._clients.items())
+            self._clients = weakref.WeakKeyDictionary()
+        for loop, client in clients:
+            if loop is current or loop is _NO_LOOP:
+                await client.aclose()
+            elif loop.is_running() and not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
 
     async def send_request(
         self,
@@ -442,6 +1454,7 @@ class AsyncChapa:
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
         headers: Optional[Dict] = None,
+        timeout: TimeoutTypes = None,
     ):
         """
         Request sender to the api
@@ -450,36 +1463,135 @@ class AsyncChapa:
             url (str): url for the request to be sent.
             method (str): the method for the request.
             data (dict, optional): request body. Defaults to None.
+            headers (dict, optional): headers of the request, added to the client
+                                      headers without modifying them. Defaults to None.
+            timeout (float | httpx.Timeout, optional): overrides the client timeout.
+                                                       Defaults to None.
 
         Returns:
             response: response of the server.
         """
+        return decode_response(
+            await self._request(
+                url, method, data=data, params=params, headers=headers, timeout=timeout
+            )
+        )
+
+    async def _request(
+        self,
+        url: str,
+        method: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: TimeoutTypes = None,
+    ) -> httpx.Response:
+        """Validate the arguments of ``send_request`` and send it"""
         if params and not isinstance(params, dict):
             raise ValueError("params must be a dict")
 
         if data and not isinstance(data, dict):
             raise ValueError("data must be a dict")
 
-        if headers and isinstance(data, dict):
-            headers.update(self.headers)
-        elif headers and not isinstance(data, dict):
-            raise ValueError("headers must be a dict")
-        else:
-            headers = self.headers
+        headers = merge_headers(self.headers, headers)
 
-        async with self.client as client:
-            func = getattr(client, method)
-            response = await func(url, data=data, headers=headers)
-            return getattr(response, "json", lambda: response.text)()
+        return await self._send(
+            method.upper(), url, data=data, params=params, headers=headers, timeout=timeout
+        )
 
-    async def _construct_request(self, *args, **kwargs):
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: TimeoutTypes = None,
+    ) -> httpx.Response:
+        """Send the request, retrying transient failures according to ``self.retry``"""
+        retryable = self.retry.allows(method, data)
+        if timeout is None:
+            timeout = httpx.USE_CLIENT_DEFAULT
+        endpoint = endpoint_name(url) if self.instrumentation else None
+        attempt = 0
+        breaker = self.circuit_breaker
+        while True:
+            permit = breaker.before_request() if breaker else None
+            try:
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire_async(url)
+                if self.instrumentation:
+                    self.instrumentation.on_request_start(method, endpoint)
+                started = time.monotonic()
+                try:
+                    response = await self.client.request(
+                        method, url, data=data, params=params, headers=headers, timeout=timeout
+                    )
+                except httpx.TransportError as error:
+                    self._record_outcome(method, endpoint, started, error=error, permit=permit)
+                    delay = self.retry.next_delay(attempt, error=error) if retryable else None
+                    if delay is None:
+                        raise
+                except BaseException as error:
+                    # cancellations and caller errors say nothing about the API health
+                    self._record_outcome(method, endpoint, started, error=error, permit=permit)
+                    raise
+                else:
+                    self._record_outcome(
+                        method, endpoint, started, response=response, permit=permit
+                    )
+                    delay = (
+                        self.retry.next_delay(attempt, response=response) if retryable else None
+                    )
+                    if delay is None:
+                        return response
+            finally:
+                if permit is not None:
+                    breaker.release(permit)
+            if self.instrumentation:
+                self.instrumentation.on_retry(method, endpoint, attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _single_flight(self, key: tuple, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``request`` once for all the concurrent callers using the same ``key``"""
+        # futures belong to the event loop that created them
+        key = (asyncio.get_running_loop(),) + key
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _construct_request(
+        self, *args, model: Optional[Type[Model]] = None, **kwargs
+    ):
         """Construct the request to send to the API"""
 
         res = await self.send_request(*args, **kwargs)
-        if self.response_format == "obj" and isinstance(res, dict):
-            return convert_response(res)
+        return self._format(res, model)
 
-        return res
+    async def _submit(
+        self, kind: str, reference: str, *args, model: Optional[Type[Model]] = None, **kwargs
+    ):
+        """Send an initialize or transfer request, journaled in ``self.outbox`` when set"""
+        _, res = await self._submit_raw(kind, reference, *args, **kwargs)
+        return self._format(res, model)
+
+    async def _submit_raw(
+        self, kind: str, reference: str, *args, **kwargs
+    ) -> Tuple[httpx.Response, Any]:
+        """``_submit`` returning the HTTP response and its raw decoded body"""
+        outbox = self.outbox
+        if outbox is not None:
+            await outbox.record_async(kind, reference, kwargs["data"])
+        response = await self._request(*args, **kwargs)
+        res = decode_response(response)
+        # after a server error the outcome is unknown, the entry is verified on replay
+        if outbox is not None and response.status_code < 500:
+            outbox.complete(kind, reference, _submit_result(res))
+        return response, res
 
     async def initialize(
         self,
@@ -495,6 +1607,7 @@ class AsyncChapa:
         return_url: Optional[str] = None,
         customization: Optional[Dict] = None,
         subaccount_id: Optional[str] = None,
+        timeout: TimeoutTypes = None,
         **kwargs,
     ):
         """Initialize the Transaction and Get a payment link
@@ -514,6 +1627,7 @@ class AsyncChapa:
             return_url (Optional[str], optional): Web address to redirect the user after payment is successful. Defaults to None.
             customization (Optional[Dict], optional): The customizations field (optional) allows you to customize the look and feel of the payment modal. You can set a logo, the store name to be displayed (title), and a description for the payment. Defaults to None.
             subaccount_id (Optional[str], optional): The subaccount id to split payment. Defaults to None.
+            timeout (float | httpx.Timeout, optional): request timeout, overrides the client timeout. Defaults to None.
             **kwargs: Additional data to be sent to the server.
 
         Returns:
@@ -540,24 +1654,11 @@ class AsyncChapa:
         if kwargs:
             data.update(kwargs)
 
-        if not isinstance(amount, int):
-            if str(amount).replace(".", "", 1).isdigit() and float(amount) > 0:
-                pass
-            else:
-                raise ValueError("invalid amount")
-        elif isinstance(amount, int):
-            if amount < 0:
-                raise ValueError("invalid amount")
-
+        parse_amount(amount)
         data["amount"] = amount
 
-        regex = re.compile(
-            r"([A-Za-z0-9]+[.-_])*[A-Za-z0-9]+@[A-Za-z0-9-]+(\.[A-Z|a-z]{2,})+"
-        )
-        if not regex.match(email):
-            raise ValueError("invalid email")
-
-        data["email"] = email
+        if email is not None:
+            data["email"] = validate_email(email)
 
         if phone_number:
             data["phone_number"] = phone_number
@@ -576,29 +1677,92 @@ class AsyncChapa:
             if "logo" in customization:
                 data["customization[logo]"] = customization["logo"]
 
-        response = await self._construct_request(
+        response = await self._submit(
+            "transaction",
+            tx_ref,
             url=f"{self.base_url}/{self.api_version}/transaction/initialize",
+            model=CheckoutSession,
             method="post",
             data=data,
+            timeout=timeout,
         )
         return response
 
-    async def verify(self, tx_ref: str, headers: Optional[Dict] = None):
+    async def verify(
+        self, tx_ref: str, headers: Optional[Dict] = None, timeout: TimeoutTypes = None
+    ):
         """Verify the transaction
 
         Args:
             tx_ref (str): transaction id
+            headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
+
+        Transactions in a final status are answered from ``verification_cache`` when it is set.
+        Concurrent calls for the same ``tx_ref`` share a single request.
 
         Returns:
             dict: response from the server
             response(Response): response object of the response data return from the Chapa server.
         """
-        response = await self._construct_request(
-            url=f"{self.base_url}/{self.api_version}/transaction/verify/{tx_ref}",
-            method="get",
-            headers=headers,
+        cache = self.verification_cache
+        if cache is not None:
+            cached = cache.get(tx_ref)
+            if cached is not None:
+                return self._format(cached, TransactionVerification)
+
+        res = await self._single_flight(
+            ("transaction", tx_ref),
+            lambda: self.send_request(
+                url=f"{self.base_url}/{self.api_version}/transaction/verify/{tx_ref}",
+                method="get",
+                headers=headers,
+                timeout=timeout,
+            ),
+        )
+        if cache is not None:
+            cache.put(tx_ref, res)
+        return self._format(res, TransactionVerification)
+
+    def verify_many(
+        self,
+        tx_refs: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        headers: Optional[Dict] = None,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> AsyncIterator[BatchResult]:
+        """Verify many transactions concurrently over the shared connection pool
+
+        Failures are reported per reference instead of aborting the batch.
+
+        Example:
+            async for result in chapa.verify_many(tx_refs, concurrency=20):
+                if result.ok:
+                    ...
+
+        Args:
+            tx_refs (Iterable[str]): transaction ids to verify
+            concurrency (int, optional): maximum in-flight requests. Defaults to 10.
+            headers(dict, optional): header to attach on the requests. Default to None
+            timeout(float | httpx.Timeout, optional): timeout of each request. Default to BATCH_TIMEOUT
+
+        Yields:
+            BatchResult: reference, response and error of each verification,
+                         in completion order. ``status`` is the transaction
+                         status ('failed' if Chapa refused the request) and
+                         ``ok`` is False when the request or the payment failed.
+        """
+
+        async def verify(tx_ref):
+            return _verify_result(
+                tx_ref, await self.verify(tx_ref, headers=headers, timeout=timeout)
+            )
+
+        return run_async(
+            verify,
+            tx_refs,
+            concurrency,
         )
-        return response
 
     async def create_subaccount(
         self,
@@ -609,6 +1773,7 @@ class AsyncChapa:
         split_type: str,
         split_value: str,
         headers: Optional[Dict] = None,
+        timeout: TimeoutTypes = None,
         **kwargs,
     ):
         """
@@ -629,6 +1794,7 @@ class AsyncChapa:
                     - to collect 3% from each transaction, split_type will be percentage and split_value will be 0.03.
                     - to collect 25 Birr from each transaction, split_type will be flat and split_value will be 25.
             headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
             **kwargs: additional data to be sent to the server
 
         Return:
@@ -654,25 +1820,66 @@ class AsyncChapa:
 
         response = await self._construct_request(
             url=f"{self.base_url}/{self.api_version}/subaccount",
+            model=Subaccount,
             method="post",
             data=data,
             headers=headers,
+            timeout=timeout,
         )
         return response
 
-    async def get_banks(self, headers: Optional[Dict] = None):
+    async def get_banks(
+        self,
+        headers: Optional[Dict] = None,
+        refresh: bool = False,
+        timeout: TimeoutTypes = None,
+    ):
         """Get the list of all banks
 
+        The list is served from ``bank_cache`` while it is fresh (one hour
+        by default) and concurrent calls share a single request. A call with
+        ``headers`` always sends the request and leaves the cache untouched.
+
+        Args:
+            headers(dict, optional): header to attach on the request. Default to None
+            timeout(float | httpx.Timeout, optional): request timeout, overrides the client timeout. Default to None
+            refresh(bool, optional): ignore the cached list. Default to False
+
         Returns:
             dict: response from the server
             response(Response): response object of the response data return from the Chapa server.
         """
-        response = await self._construct_request(
-            url=f"{self.base_url}/{self.api_version}/banks",
-            method="get",
-            headers=headers,
-        )
-        return response
+
+        def fetch():
+            return self.send_request(
+                url=f"{self.base_url}/{self.api_version}/banks",
+                method="get",
+                headers=headers,
+                timeout=timeout,
+            )
+
+        if headers:
+            return self._format(await fetch(), Bank)
+        if refresh:
+            self.bank_cache.invalidate()
+
+        res = await self.bank_cache.get_async(fetch)
+        return self._format(res, Bank)
+
+    async def find_bank(self, bank) -> Optional[dict]:
+        """Find a bank by id, slug, swift code or name
+
+        The bank list is only fetched when the cache is stale, lookups are
+        otherwise served from the in-memory index.
+
+        Args:
+            bank: bank id (the bank_code of transfers), slug, swift code or name
+
+        Returns:
+            dict: the bank, None if it does not exist
+        """
+        await self.get_banks()
+        return self.bank_cache.lookup(bank)
 
     async def transfer_to_bank(
         self,
@@ -684,6 +1891,8 @@ class AsyncChapa:
         beneficiary_name: Optional[str],
         bank_code: str,
         currency: str = "ETB",
+        validate_bank_code: bool = False,
+        timeout: TimeoutTypes = None,
     ):
         """Initiate a Bank Transfer
 
@@ -697,6 +1906,8 @@ class AsyncChapa:
             currency (float): This is the currency for the Transfer. Expected value is ETB.  Default value is ETB.
             reference (str): This a merchant’s uniques reference for the transfer, it can be used to query for the status of the transfer
             bank_code (str): This is the recipient bank code. You can see a list of all the available banks and their codes from the get banks endpoint.
+            validate_bank_code (bool, optional): check bank_code against the ids of the cached bank list before sending. Defaults to False.
+            timeout (float | httpx.Timeout, optional): request timeout, overrides the client timeout. Defaults to None.
 
         Returns:
             dict: response from the server
@@ -705,31 +1916,62 @@ class AsyncChapa:
                 - data: str | None
             response(Response): response object of the response data return from the Chapa server.
         """
+        _, res = await self._transfer(
+            {
+                "account_name": account_name,
+                "account_number": account_number,
+                "amount": amount,
+                "reference": reference,
+                "beneficiary_name": beneficiary_name,
+                "bank_code": bank_code,
+                "currency": currency,
+                "validate_bank_code": validate_bank_code,
+            },
+            timeout=timeout,
+        )
+        return self._format(res)
+
+    async def _transfer(
+        self, spec: Dict[str, Any], timeout: TimeoutTypes = None
+    ) -> Tuple[httpx.Response, Any]:
+        """Send a transfer spec (keyword arguments of ``transfer_to_bank``), unformatted"""
+        bank_code = spec["bank_code"]
+        if spec.get("validate_bank_code"):
+            await self.get_banks()
+            if self.bank_cache.lookup_code(bank_code) is None:
+                raise ValueError("invalid bank_code")
+
+        reference = spec["reference"]
         data = {
-            "account_name": account_name,
-            "account_number": account_number,
-            "amount": amount,
+            "account_name": spec["account_name"],
+            "account_number": spec["account_number"],
+            "amount": spec["amount"],
             "reference": reference,
             "bank_code": bank_code,
-            "currency": currency,
+            "currency": spec.get("currency", "ETB"),
         }
-        if beneficiary_name:
-            data["beneficiary_name"] = beneficiary_name
+        if spec.get("beneficiary_name"):
+            data["beneficiary_name"] = spec["beneficiary_name"]
 
-        response = await self._construct_request(
+        return await self._submit_raw(
+            "transfer",
+            reference,
             url=f"{self.base_url}/{self.api_version}/transfer",
             method="post",
             data=data,
+            timeout=timeout,
         )
-        return response
 
-    async def verify_transfer(self, reference: str):
+    async def verify_transfer(self, reference: str, timeout: TimeoutTypes = None):
         """Verify the status of a transfer
 
         This section describes how to verify the status of a transfer with Chapa
 
         Args:
             reference (str): This a merchant’s uniques reference for the transfer, it can be used to query for the status of the transfer
+            timeout (float | httpx.Timeout, optional): request timeout, overrides the client timeout. Defaults to None.
+
+        Concurrent calls for the same ``reference`` share a single request.
 
         Returns:
             dict: response from the server
@@ -738,11 +1980,304 @@ class AsyncChapa:
                 - data: str | None
             response(Response): response object of the response data return from the Chapa server.
         """
-        response = await self._construct_request(
-            url=f"{self.base_url}/{self.api_version}/transfer/verify/{reference}",
-            method="get",
+        res = await self._single_flight(
+            ("transfer", reference),
+            lambda: self.send_request(
+                url=f"{self.base_url}/{self.api_version}/transfer/verify/{reference}",
+                method="get",
+                timeout=timeout,
+            ),
+        )
+        return self._format(res, TransferStatus)
+
+    async def transfer_many(
+        self,
+        transfers: Union[Iterable[dict], AsyncIterable[dict]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: Optional[float] = None,
+        poll_interval: float = 2.0,
+        max_polls: int = 10,
+        submitted: Optional[Iterable[str]] = None,
+        on_submit: Optional[Callable[[str], None]] = None,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> AsyncIterator[BatchResult]:
+        """Submit many bank transfers and follow each one up to its final status
+
+        Async version of ``Chapa.transfer_many``, ``transfers`` may also be an
+        async iterable.
+
+        Example:
+            async for result in chapa.transfer_many(specs, concurrency=20, rate=5):
+                print(result.reference, result.status)
+
+        Args:
+            transfers (Iterable[dict] | AsyncIterable[dict]): keyword arguments of
+                                                              ``transfer_to_bank``
+            concurrency (int, optional): maximum transfers processed in parallel. Defaults to 10.
+            rate (float, optional): maximum submissions per second. Defaults to no limit.
+            poll_interval (float, optional): seconds between two verifications. Defaults to 2.0.
+            max_polls (int, optional): verifications before giving up with a 'pending'
+                                       status. Defaults to 10.
+            submitted (Iterable[str], optional): references possibly submitted by a
+                                                 previous run, verified before sending.
+            on_submit (Callable, optional): called with each reference before it is sent.
+            timeout (float | httpx.Timeout, optional): timeout of each request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            BatchResult: one result per reference, in completion order. ``status``
+                         is the final transfer status, 'rejected' if the
+                         submission was refused or 'pending' if polling gave up.
+
+        Raises:
+            ValueError: If a transfer spec is invalid.
+        """
+        if hasattr(transfers, "__aiter__"):
+            transfers = [transfer async for transfer in transfers]
+        specs = validate_transfers(transfers)
+        submitted = set(submitted or ())
+        pacer = Pacer(rate)
+
+        async def process(spec):
+            reference = spec["reference"]
+            response = None
+            if reference in submitted:
+                response = await self.verify_transfer(reference, timeout=timeout)
+                result = _transfer_result(reference, response)
+                if result:
+                    return result
+            if reference not in submitted or is_not_found(response):
+                if on_submit:
+                    on_submit(reference)
+                await pacer.wait_async()
+                try:
+                    sent, body = await self._transfer(spec, timeout=timeout)
+                except _UNKNOWN_OUTCOME_ERRORS:
+                    # Chapa may have received the transfer before the failure
+                    if is_not_found(await self.verify_transfer(reference, timeout=timeout)):
+                        raise
+                else:
+                    # after a server error the outcome is unknown, the polls tell
+                    if sent.status_code < 500 and get_field(body, "status") != "success":
+                        return BatchResult(
+                            reference, response=self._format(body), status="rejected"
+                        )
+
+            for attempt in range(max_polls):
+                if attempt:
+                    await asyncio.sleep(poll_interval)
+                response = await self.verify_transfer(reference, timeout=timeout)
+                result = _transfer_result(reference, response)
+                if result:
+                    return result
+            return BatchResult(reference, response=response, status="pending")
+
+        results = run_async(process, specs, concurrency, key=itemgetter("reference"))
+        async for result in results:
+            yield result
+
+    def iter_transactions(
+        self,
+        params: Optional[Dict] = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> AsyncIterator[Any]:
+        """Iterate over every transaction of the account, page after page
+
+        The pages are requested lazily; while a page is consumed the next one
+        is fetched by a background task, and at most ``prefetch`` pages wait
+        in memory.
+
+        Example:
+            async for transaction in chapa.iter_transactions():
+                print(transaction["tx_ref"], transaction["status"])
+
+        Args:
+            params (dict, optional): filters of the list endpoint. Defaults to None.
+            prefetch (int, optional): pages fetched ahead. Defaults to 1.
+            timeout (float | httpx.Timeout, optional): timeout of each page request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            dict | Response | TransactionVerification: every transaction
+
+        Raises:
+            ValueError: If a page request is refused.
+        """
+        return self._iter_list("transactions", "transactions", TransactionVerification,
+                               params, prefetch, timeout)
+
+    def iter_transfers(
+        self,
+        params: Optional[Dict] = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> AsyncIterator[Any]:
+        """Iterate over every transfer of the account, page after page
+
+        Same as ``iter_transactions`` for transfers.
+
+        Args:
+            params (dict, optional): filters of the list endpoint. Defaults to None.
+            prefetch (int, optional): pages fetched ahead. Defaults to 1.
+            timeout (float | httpx.Timeout, optional): timeout of each page request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            dict | Response | TransferStatus: every transfer
+
+        Raises:
+            ValueError: If a page request is refused.
+        """
+        return self._iter_list("transfers", "transfers", TransferStatus, params, prefetch, timeout)
+
+    async def _iter_list(self, path, key, model, params, prefetch, timeout) -> AsyncIterator[Any]:
+        url = f"{self.base_url}/{self.api_version}/{path}"
+
+        async def fetch(token: PageToken):
+            if isinstance(token, str):
+                response = await self.send_request(self._page_url(token), "get", timeout=timeout)
+            else:
+                response = await self.send_request(
+                    url, "get", params={**(params or {}), "page": token}, timeout=timeout
+                )
+            if get_field(response, "status") != "success":
+                raise ValueError(f"cannot list {path}: {get_field(response, 'message')}")
+            return response
+
+        async for page in iter_pages_async(fetch, key, prefetch):
+            for item in page_items(page, key):
+                yield self._format_item(item, model)
+
+    def replay_outbox(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: TimeoutTypes = BATCH_TIMEOUT,
+    ) -> AsyncIterator[BatchResult]:
+        """Verify the journaled calls whose outcome is unknown, e.g. after a crash
+
+        Every unresolved ``outbox`` entry is verified with ``verify`` or
+        ``verify_transfer`` and resolved with the verified status, or
+        'not_found' if Chapa never received it. Nothing is sent again.
+
+        Args:
+            concurrency (int, optional): maximum concurrent verifications. Defaults to 10.
+            timeout (float | httpx.Timeout, optional): timeout of each request.
+                                                       Defaults to BATCH_TIMEOUT.
+
+        Yields:
+            BatchResult: one result per unresolved entry, in completion order. ``status``
+                         is None when the outcome is still unknown.
+
+        Raises:
+            ValueError: If the client has no outbox.
+        """
+        outbox = self.outbox
+        if outbox is None:
+            raise ValueError("replay_outbox requires an outbox")
+
+        async def resolve(entry: OutboxEntry) -> BatchResult:
+            if entry.kind == "transfer":
+                response = await self.verify_transfer(entry.reference, timeout=timeout)
+            else:
+                response = await self.verify(entry.reference, timeout=timeout)
+            status = _replay_result(response)
+            if status:
+                outbox.complete(entry.kind, entry.reference, status)
+            return BatchResult(entry.reference, response=response, status=status)
+
+        results = run_async(resolve, outbox.unresolved(), concurrency, key=attrgetter("reference"))
+        return _flushing_async(results, outbox)
+
+    def watch(
+        self,
+        tx_refs: Iterable[str],
+        initial_interval: float = 2.0,
+        max_interval: float = 60.0,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_failures: Optional[int] = 5,
+    ) -> AsyncIterator[StatusChange]:
+        """Poll many transactions until they reach a final status
+
+        All the transactions are polled from one scheduler with a per
+        transaction adaptive backoff, and dropped once final.
+
+        Example:
+            async for change in chapa.watch(tx_refs, rate=20):
+                if change.final:
+                    print(change.reference, change.status)
+
+        Args:
+            tx_refs (Iterable[str]): transaction references to watch
+            initial_interval (float, optional): first polling interval in seconds. Defaults to 2.
+            max_interval (float, optional): maximum polling interval in seconds. Defaults to 60.
+            concurrency (int, optional): maximum requests in flight. Defaults to 10.
+            rate (float, optional): global budget of requests per second. Defaults to no limit.
+            timeout (float, optional): seconds after which the watch stops. Defaults to no limit.
+            max_failures (int, optional): failed polls in a row after which a reference is
+                                          dropped with the status 'error' or 'not_found'.
+                                          Defaults to 5.
+
+        Yields:
+            StatusChange: every status change of the watched transactions
+        """
+        return watch(
+            lambda tx_ref: self.verify(tx_ref, timeout=BATCH_TIMEOUT),
+            tx_refs,
+            data_status,
+            TRANSACTION_TERMINAL_STATUSES,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            concurrency=concurrency,
+            rate=rate,
+            timeout=timeout,
+            max_failures=max_failures,
+            not_found=is_not_found,
+        )
+
+    def watch_transfers(
+        self,
+        references: Iterable[str],
+        initial_interval: float = 2.0,
+        max_interval: float = 60.0,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_failures: Optional[int] = 5,
+    ) -> AsyncIterator[StatusChange]:
+        """Poll many transfers until they reach a final status
+
+        Same as ``watch`` for transfers, polled with ``verify_transfer``.
+
+        Args:
+            references (Iterable[str]): transfer references to watch
+            initial_interval (float, optional): first polling interval in seconds. Defaults to 2.
+            max_interval (float, optional): maximum polling interval in seconds. Defaults to 60.
+            concurrency (int, optional): maximum requests in flight. Defaults to 10.
+            rate (float, optional): global budget of requests per second. Defaults to no limit.
+            timeout (float, optional): seconds after which the watch stops. Defaults to no limit.
+            max_failures (int, optional): failed polls in a row after which a reference is
+                                          dropped with the status 'error' or 'not_found'.
+                                          Defaults to 5.
+
+        Yields:
+            StatusChange: every status change of the watched transfers
+        """
+        return watch(
+            lambda reference: self.verify_transfer(reference, timeout=BATCH_TIMEOUT),
+            references,
+            data_status,
+            TRANSFER_TERMINAL_STATUSES,
+            initial_interval=initial_interval,
+            max_interval=max_interval,
+            concurrency=concurrency,
+            rate=rate,
+            timeout=timeout,
+            max_failures=max_failures,
+            not_found=is_not_found,
         )
-        return response
 
 
 def get_testing_cards(self):
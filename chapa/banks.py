@@ -0,0 +1,151 @@
+"""
+In-process cache of the Chapa bank list
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+DEFAULT_BANKS_TTL = 3600.0
+
+BANK_INDEX_FIELDS = ("id", "slug", "swift", "name")
+
+
+def _normalize(value: Any) -> str:
+    return str(value).strip().casefold()
+
+
+class BankCache:
+    """
+    TTL cache of the ``/banks`` response with a lookup index.
+
+    Concurrent refreshes are coalesced: when the cache is stale, a hundred
+    threads or coroutines asking for the banks trigger a single fetch. Only
+    successful responses are cached.
+
+    The index maps the bank id, slug, swift code and name (case-insensitive)
+    to the bank for ``lookup``. Bank codes are validated against a separate
+    index of the ids only (``lookup_code``), since the API accepts no other
+    value as ``bank_code``.
+
+    A single cache may be shared by several ``Chapa``/``AsyncChapa`` instances.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_BANKS_TTL):
+        """
+        Args:
+            ttl (float, optional): seconds a fetched bank list stays fresh. Use 0 to
+                                   always fetch. Defaults to 3600.
+        """
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        self.ttl = ttl
+        self._response = None
+        self._index: Dict[str, dict] = {}
+        self._codes: Dict[str, dict] = {}
+        self._expires = 0.0
+        self._lock = threading.Lock()
+        self._inflight: Optional[asyncio.Future] = None
+
+    def is_fresh(self) -> bool:
+        """True if a cached bank list is available and not expired."""
+        return self._response is not None and time.monotonic() < self._expires
+
+    def invalidate(self) -> None:
+        """Force the next read to fetch the bank list again."""
+        self._expires = 0.0
+
+    def store(self, response: Any) -> None:
+        """Cache ``response`` and rebuild the index if it is a successful bank list."""
+        if not isinstance(response, dict) or response.get("status") != "success":
+            return
+        banks = response.get("data")
+        if not isinstance(banks, list):
+            return
+
+        index = {}
+        codes = {}
+        for bank in banks:
+            if not isinstance(bank, dict):
+                continue
+            for field in BANK_INDEX_FIELDS:
+                if bank.get(field) is not None:
+                    index.setdefault(_normalize(bank[field]), bank)
+            if bank.get("id") is not None:
+                codes.setdefault(_normalize(bank["id"]), bank)
+
+        self._index = index
+        self._codes = codes
+        self._response = response
+        self._expires = time.monotonic() + self.ttl
+
+    def lookup(self, bank: Any) -> Optional[dict]:
+        """
+        Find a cached bank by id, slug, swift code or name
+
+        Args:
+            bank (Any): bank id, slug, swift code or name
+
+        Returns:
+            dict: the bank, None if it is unknown or nothing is cached yet
+        """
+        return self._index.get(_normalize(bank))
+
+    def lookup_code(self, bank_code: Any) -> Optional[dict]:
+        """
+        Find a cached bank by id, the ``bank_code`` of transfers
+
+        Args:
+            bank_code (Any): bank id
+
+        Returns:
+            dict: the bank, None if it is unknown or nothing is cached yet
+        """
+        return self._codes.get(_normalize(bank_code))
+
+    def get(self, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached bank list, calling ``fetch`` once if it is stale
+
+        Args:
+            fetch (Callable): returns the raw ``/banks`` response
+
+        Returns:
+            Any: the cached or freshly fetched response
+        """
+        if self.is_fresh():
+            return self._response
+        with self._lock:
+            if self.is_fresh():
+                return self._response
+            response = fetch()
+            self.store(response)
+            return response
+
+    async def get_async(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of ``get``, concurrent callers share the same fetch
+
+        Args:
+            fetch (Callable): coroutine function returning the raw ``/banks`` response
+
+        Returns:
+            Any: the cached or freshly fetched response
+        """
+        if self.is_fresh():
+            return self._response
+        inflight = self._inflight
+        # a fetch running on another event loop cannot be awaited from this one
+        if inflight is None or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = self._inflight = asyncio.ensure_future(self._refresh(fetch))
+        return await asyncio.shield(inflight)
+
+    async def _refresh(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            response = await fetch()
+            self.store(response)
+            return response
+        finally:
+            if self._inflight is asyncio.current_task():
+                self._inflight = None
@@ -0,0 +1,208 @@
+"""
+Batch helpers for running many Chapa API calls with bounded concurrency
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+
+DEFAULT_CONCURRENCY = 10
+
+# statuses of a BatchResult reporting a failed payment, transfer or submission
+FAILED_STATUSES = frozenset({"failed", "reversed", "cancelled", "rejected"})
+
+T = TypeVar("T")
+
+_END = object()
+
+
+def _response_status(response: Any) -> Optional[str]:
+    """``status`` field of a 'json' or 'obj' formatted response"""
+    if isinstance(response, dict):
+        status = response.get("status")
+    else:
+        status = getattr(response, "status", None)
+    return str(status).lower() if status else None
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a single call inside a batch.
+
+    Exactly one of ``response`` and ``error`` is set. ``status`` is reported
+    by the call, e.g. the status of the verified transaction or transfer.
+    """
+
+    reference: str
+    response: Any = None
+    error: Optional[BaseException] = None
+    status: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the call returned a response and neither it nor ``status`` is a failure."""
+        return (
+            self.error is None
+            and self.status not in FAILED_STATUSES
+            and _response_status(self.response) != "failed"
+        )
+
+
+class Pacer:
+    """Space calls out so that at most ``rate`` of them start per second.
+
+    A single pacer can be shared by threads and coroutines alike.
+    """
+
+    def __init__(self, rate: Optional[float] = None):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be a positive number")
+        self.interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve the next slot and return how long to wait for it."""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            return start - now
+
+    def wait(self) -> None:
+        """Block until the next slot is available."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self) -> None:
+        """Sleep until the next slot is available."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+
+
+def _to_result(reference: str, value: Any) -> BatchResult:
+    if isinstance(value, BatchResult):
+        return value
+    return BatchResult(reference, response=value)
+
+
+def run_threaded(
+    func: Callable[[T], Any],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    key: Optional[Callable[[T], str]] = None,
+) -> Iterator[BatchResult]:
+    """
+    Call ``func`` for every item on a thread pool, yielding results as
+    they complete.
+
+    At most ``concurrency`` calls are in flight at once and ``items`` is
+    consumed lazily, so arbitrarily long iterables run in constant memory.
+
+    Args:
+        func (Callable): function called with a single item. It may return
+                         a BatchResult to report a custom status.
+        items (Iterable): references (or specs) to process.
+        concurrency (int, optional): maximum parallel calls. Defaults to 10.
+        key (Callable, optional): extracts the reference from an item.
+                                  Defaults to the item itself.
+
+    Yields:
+        BatchResult: the result of each call, in completion order.
+    """
+    _check_concurrency(concurrency)
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+
+        def fill():
+            while len(pending) < concurrency:
+                item = next(items, _END)
+                if item is _END:
+                    return
+                reference = key(item) if key else item
+                pending[executor.submit(func, item)] = reference
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                reference = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    yield _to_result(reference, future.result())
+                else:
+                    yield BatchResult(reference, error=error)
+            fill()
+
+
+async def run_async(
+    func: Callable[[T], Awaitable[Any]],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    key: Optional[Callable[[T], str]] = None,
+) -> AsyncIterator[BatchResult]:
+    """
+    Await ``func`` for every item, yielding results as they complete.
+
+    At most ``concurrency`` coroutines are in flight at once and ``items``
+    is consumed lazily.
+
+    Args:
+        func (Callable): coroutine function called with a single item. It may
+                         return a BatchResult to report a custom status.
+        items (Iterable): references (or specs) to process.
+        concurrency (int, optional): maximum parallel calls. Defaults to 10.
+        key (Callable, optional): extracts the reference from an item.
+                                  Defaults to the item itself.
+
+    Yields:
+        BatchResult: the result of each call, in completion order.
+    """
+    _check_concurrency(concurrency)
+    items = iter(items)
+    pending = {}
+
+    def fill():
+        while len(pending) < concurrency:
+            item = next(items, _END)
+            if item is _END:
+                return
+            reference = key(item) if key else item
+            pending[asyncio.ensure_future(func(item))] = reference
+
+    fill()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                reference = pending.pop(task)
+                error = task.exception()
+                if error is None:
+                    yield _to_result(reference, task.result())
+                else:
+                    yield BatchResult(reference, error=error)
+            fill()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,217 @@
+"""
+Circuit breaker protecting callers from a degraded Chapa API
+"""
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit is open."""
+
+    def __init__(self, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(f"Chapa API circuit is open, retry in {retry_in:.1f}s")
+
+
+class Permit:
+    """Probe slot handed out by ``CircuitBreaker.before_request`` while half-open"""
+
+    __slots__ = ("generation", "settled")
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.settled = False
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the Chapa API is failing or too slow.
+
+    The breaker tracks the outcome of the last ``window`` requests. A request
+    fails when it raises a transport error, gets a 5xx response or takes
+    longer than ``slow_call_threshold``. Once at least ``minimum_calls``
+    outcomes are recorded and the failure rate reaches ``failure_rate``,
+    the circuit opens and every request raises ``CircuitOpenError`` without
+    being sent.
+
+    After ``reset_timeout`` seconds the circuit half-opens and lets
+    ``half_open_calls`` probe requests through. If they all succeed the
+    circuit closes, any failure opens it again. Probes that are still
+    unanswered ``reset_timeout`` seconds later give their slot to new ones.
+
+    ``before_request`` returns a permit that must be passed to ``record``
+    once the outcome is known, and to ``release`` in every case, so that a
+    probe cancelled before its outcome is recorded frees its slot.
+
+    A breaker can be shared by several ``Chapa``/``AsyncChapa`` instances.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        minimum_calls: int = 20,
+        window: int = 100,
+        slow_call_threshold: Optional[float] = None,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+    ):
+        """
+        Args:
+            failure_rate (float, optional): failure ratio that opens the circuit. Defaults to 0.5.
+            minimum_calls (int, optional): outcomes needed before the rate is evaluated.
+                                           Defaults to 20.
+            window (int, optional): number of recent outcomes considered. Defaults to 100.
+            slow_call_threshold (float, optional): seconds after which a successful call
+                                                   counts as a failure. Defaults to None.
+            reset_timeout (float, optional): seconds the circuit stays open. Defaults to 30.
+            half_open_calls (int, optional): probe requests allowed while half-open.
+                                             Defaults to 1.
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        if minimum_calls < 1 or window < minimum_calls:
+            raise ValueError("window must be at least minimum_calls, which must be positive")
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+
+        self._outcomes = deque(maxlen=window)
+        self._failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_opened_at = 0.0
+        self._generation = 0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        now = time.monotonic()
+        if (self._state == self.OPEN and now - self._opened_at >= self.reset_timeout) or (
+            # the probes in flight never answered, let new ones through
+            self._state == self.HALF_OPEN
+            and self._probes >= self.half_open_calls
+            and now - self._half_opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._half_opened_at = now
+            self._generation += 1
+            self._probes = 0
+            self._probe_successes = 0
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._failures = 0
+
+    def before_request(self) -> Optional["Permit"]:
+        """
+        Check that a request may be sent
+
+        Returns:
+            Permit: the permit of a half-open probe, None while the circuit is closed
+
+        Raises:
+            CircuitOpenError: if the circuit is open or its probes are all in flight.
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return None
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return Permit(self._generation)
+            if self._state == self.HALF_OPEN:
+                started = self._half_opened_at
+            else:
+                started = self._opened_at
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - started))
+            raise CircuitOpenError(retry_in)
+
+    def record(
+        self, success: bool, duration: float = 0.0, permit: Optional["Permit"] = None
+    ) -> None:
+        """
+        Record the outcome of a request allowed by ``before_request``
+
+        Args:
+            success (bool): False for transport errors and 5xx responses
+            duration (float, optional): request duration in seconds. Defaults to 0.
+            permit (Permit, optional): permit returned by ``before_request``. Defaults to None.
+        """
+        if self.slow_call_threshold is not None and duration > self.slow_call_threshold:
+            success = False
+
+        with self._lock:
+            if permit is not None:
+                if permit.settled:
+                    return
+                permit.settled = True
+                # the probe outlived its deadline, new probes already replaced it
+                if self._state != self.HALF_OPEN or permit.generation != self._generation:
+                    return
+            if self._state == self.HALF_OPEN:
+                if not success:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    self._state = self.CLOSED
+                return
+
+            if self._state == self.OPEN:
+                return
+
+            if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0]:
+                self._failures -= 1
+            self._outcomes.append(success)
+            if not success:
+                self._failures += 1
+
+            if (
+                len(self._outcomes) >= self.minimum_calls
+                and self._failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def release(self, permit: Optional["Permit"]) -> None:
+        """
+        Give back the slot of a probe whose outcome was not recorded
+
+        Call it once the request is over, whatever happened, e.g. in a
+        ``finally`` block. It does nothing if the outcome was recorded.
+
+        Args:
+            permit (Permit): permit returned by ``before_request``, None is ignored
+        """
+        if permit is None:
+            return
+        with self._lock:
+            if permit.settled:
+                return
+            permit.settled = True
+            if self._state == self.HALF_OPEN and permit.generation == self._generation:
+                self._probes -= 1
+
+    def reset(self) -> None:
+        """Close the circuit and forget every recorded outcome"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._failures = 0
@@ -0,0 +1,397 @@
+"""
+Local emulator of the Chapa API for offline development and load testing
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+
+import httpx
+
+from .validation import parse_amount, validate_email
+from .webhook import WEBHOOKS_EVENT_DESCRIPTION, WebhookVerifier
+
+
+EMULATOR_BANKS = [
+    {"id": 130, "slug": "abay_bank", "swift": "ABAYETAA", "name": "Abay Bank", "acct_length": 16,
+     "country_id": 1, "currency": "ETB", "is_mobilemoney": None, "is_active": 1, "is_rtgs": 1,
+     "active": 1, "is_24hrs": None},
+    {"id": 656, "slug": "awash_bank", "swift": "AWINETAA", "name": "Awash Bank", "acct_length": 14,
+     "country_id": 1, "currency": "ETB", "is_mobilemoney": None, "is_active": 1, "is_rtgs": 1,
+     "active": 1, "is_24hrs": None},
+    {"id": 946, "slug": "cbe_bank", "swift": "CBETETAA", "name": "Commercial Bank of Ethiopia (CBE)",
+     "acct_length": 13, "country_id": 1, "currency": "ETB", "is_mobilemoney": None,
+     "is_active": 1, "is_rtgs": 1, "active": 1, "is_24hrs": None},
+    {"id": 855, "slug": "telebirr", "swift": "TELEBIRR", "name": "telebirr", "acct_length": 10,
+     "country_id": 1, "currency": "ETB", "is_mobilemoney": 1, "is_active": 1, "is_rtgs": None,
+     "active": 1, "is_24hrs": None},
+]
+
+Latency = Union[float, Tuple[float, float]]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _reply(status_code: int, message: Any, status: str = "success", data: Any = None):
+    return httpx.Response(
+        status_code, json={"message": message, "status": status, "data": data}
+    )
+
+
+def _failed(status_code: int, message: Any) -> httpx.Response:
+    return _reply(status_code, message, status="failed")
+
+
+class ChapaEmulator:
+    """
+    In-memory implementation of the Chapa API served through an httpx transport
+
+    Implements transaction initialize/verify/list, transfer/verify/list,
+    banks and subaccount creation. Transactions and transfers start
+    ``pending`` and settle after ``settle_after`` seconds (checked lazily on
+    verify) or when ``settle`` is called. Settling emits a webhook signed
+    like Chapa does, so it can be checked with ``verify_webhook_bytes``.
+
+    Latency and errors can be injected to load test an integration.
+
+    Example:
+        emulator = ChapaEmulator(secret="test-secret", latency=(0.01, 0.05), error_rate=0.01)
+        chapa = Chapa("test-secret")
+        chapa.client = httpx.Client(transport=emulator.transport())
+
+        async_chapa = AsyncChapa("test-secret")
+        async_chapa.client = httpx.AsyncClient(transport=emulator.async_transport())
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        webhook_secret: Optional[str] = None,
+        on_webhook: Optional[Callable[[bytes, Dict[str, str]], Any]] = None,
+        settle_after: Optional[float] = 0.0,
+        success_rate: float = 1.0,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        page_size: int = 10,
+    ):
+        """
+        Args:
+            secret (str, optional): expected secret key, any key is accepted when None.
+            webhook_secret (str, optional): key signing the webhooks. Defaults to ``secret``.
+            on_webhook (Callable, optional): called with the raw body and headers of each
+                                             webhook. Defaults to None.
+            settle_after (float, optional): seconds before a pending payment settles on
+                                            verify, None to settle only through ``settle``.
+                                            Defaults to 0.
+            success_rate (float, optional): probability that a payment settles as success
+                                            rather than failed. Defaults to 1.
+            latency (float | Tuple[float, float], optional): seconds added to every request,
+                                                             or a (min, max) range. Defaults to 0.
+            error_rate (float, optional): probability of answering ``error_status``.
+                                          Defaults to 0.
+            error_status (int, optional): status code of injected errors. Defaults to 503.
+            seed (int, optional): seed of the random generator. Defaults to None.
+            page_size (int, optional): items per page of the list endpoints. Defaults to 10.
+        """
+        self.secret = secret
+        self.on_webhook = on_webhook
+        self.settle_after = settle_after
+        self.success_rate = success_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.page_size = page_size
+        self.transactions: Dict[str, dict] = {}
+        self.transfers: Dict[str, dict] = {}
+        self.subaccounts: Dict[str, dict] = {}
+        self.requests = 0
+        self._verifier = WebhookVerifier(webhook_secret or secret or "")
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._created: Dict[str, float] = {}
+
+    def transport(self) -> httpx.MockTransport:
+        """Transport for ``httpx.Client``, latency is injected with time.sleep"""
+        return httpx.MockTransport(self.handle)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """Transport for ``httpx.AsyncClient``, latency is injected with asyncio.sleep"""
+        return httpx.MockTransport(self.handle_async)
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            return self._random.uniform(*self.latency)
+        return self.latency
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request, blocking for the injected latency"""
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+        return self._route(request)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request, sleeping asynchronously for the injected latency"""
+        delay = self._delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._route(request)
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                return _failed(self.error_status, "Service Unavailable")
+
+        if self.secret is not None:
+            if request.headers.get("Authorization") != f"Bearer {self.secret}":
+                return _failed(401, "Invalid API Key or User doesn't exist")
+
+        parts = request.url.path.strip("/").split("/")
+        if parts and parts[0][:1] == "v":
+            parts = parts[1:]
+        method = request.method
+        data = self._body(request)
+
+        if method == "POST" and parts == ["transaction", "initialize"]:
+            return self._initialize(data)
+        if method == "GET" and parts[:2] == ["transaction", "verify"] and len(parts) == 3:
+            return self._verify(parts[2])
+        if method == "POST" and parts == ["transfer"]:
+            return self._transfer(data)
+        if method == "GET" and parts[:2] == ["transfer", "verify"] and len(parts) == 3:
+            return self._verify_transfer(parts[2])
+        if method == "GET" and parts == ["banks"]:
+            return _reply(200, "Banks retrieved", data=EMULATOR_BANKS)
+        if method == "POST" and parts == ["subaccount"]:
+            return self._subaccount(data)
+        if method == "GET" and parts in (["transactions"], ["transfers"]):
+            return self._list(request, parts[0])
+        return _failed(404, "Invalid Endpoint")
+
+    @staticmethod
+    def _body(request: httpx.Request) -> Dict[str, Any]:
+        content = request.content
+        if not content:
+            return {}
+        if request.headers.get("Content-Type", "").startswith("application/json"):
+            return json.loads(content)
+        return dict(parse_qsl(content.decode(), keep_blank_values=True))
+
+    def _initialize(self, data: Dict[str, Any]) -> httpx.Response:
+        errors = {}
+        try:
+            amount = parse_amount(data.get("amount"))
+        except ValueError:
+            errors["amount"] = ["The amount must be a number greater than 0."]
+        if not data.get("tx_ref"):
+            errors["tx_ref"] = ["The tx ref field is required."]
+        if data.get("email"):
+            try:
+                validate_email(data["email"])
+            except ValueError:
+                errors["email"] = ["The email must be a valid email address."]
+        if data.get("currency", "ETB") not in ("ETB", "USD"):
+            errors["currency"] = ["The selected currency is invalid."]
+        if errors:
+            return _failed(400, errors)
+
+        tx_ref = data["tx_ref"]
+        with self._lock:
+            if tx_ref in self.transactions:
+                return _failed(400, "Transaction reference has been used")
+            created = _now()
+            self.transactions[tx_ref] = {
+                "first_name": data.get("first_name"),
+                "last_name": data.get("last_name"),
+                "email": data.get("email"),
+                "currency": data.get("currency", "ETB"),
+                "amount": f"{amount:,.2f}",
+                "charge": f"{amount * Decimal('0.035'):,.2f}",
+                "mode": "test",
+                "method": "test",
+                "type": "API",
+                "status": "pending",
+                "reference": uuid.uuid4().hex[:10].upper(),
+                "tx_ref": tx_ref,
+                "customization": {
+                    "title": data.get("customization[title]"),
+                    "description": data.get("customization[description]"),
+                    "logo": data.get("customization[logo]"),
+                },
+                "meta": None,
+                "created_at": created,
+                "updated_at": created,
+            }
+            self._created[f"transaction:{tx_ref}"] = time.monotonic()
+        checkout_url = f"https://checkout.chapa.co/checkout/payment/{uuid.uuid4().hex}"
+        return _reply(200, "Hosted Link", data={"checkout_url": checkout_url})
+
+    def _verify(self, tx_ref: str) -> httpx.Response:
+        self._maybe_settle("transaction", tx_ref)
+        with self._lock:
+            transaction = self.transactions.get(tx_ref)
+            transaction = dict(transaction) if transaction else None
+        if transaction is None:
+            return _failed(404, "Invalid transaction or Transaction not found")
+        return _reply(200, "Payment details", data=transaction)
+
+    def _transfer(self, data: Dict[str, Any]) -> httpx.Response:
+        required = ("account_name", "account_number", "amount", "reference", "bank_code")
+        errors = {name: [f"The {name} field is required."] for name in required if not data.get(name)}
+        if "amount" not in errors:
+            try:
+                parse_amount(data["amount"])
+            except ValueError:
+                errors["amount"] = ["The amount must be a number greater than 0."]
+        if errors:
+            return _failed(400, errors)
+        if not any(str(bank["id"]) == str(data["bank_code"]) for bank in EMULATOR_BANKS):
+            return _failed(400, "Invalid bank code")
+
+        reference = data["reference"]
+        with self._lock:
+            if reference in self.transfers:
+                return _failed(400, "Transfer reference has been used")
+            created = _now()
+            self.transfers[reference] = {
+                "account_name": data["account_name"],
+                "account_number": data["account_number"],
+                "mobile": None,
+                "currency": data.get("currency", "ETB"),
+                "amount": float(data["amount"]),
+                "charge": 0,
+                "mode": "test",
+                "transfer_method": "bank",
+                "narration": None,
+                "chapa_transfer_id": str(uuid.uuid4()),
+                "bank_code": int(data["bank_code"]),
+                "bank_name": None,
+                "cross_party_reference": None,
+                "ip_address": None,
+                "status": "pending",
+                "tx_ref": reference,
+                "created_at": created,
+                "updated_at": created,
+            }
+            self._created[f"transfer:{reference}"] = time.monotonic()
+        return _reply(200, "Transfer Queued Successfully", data=reference)
+
+    def _verify_transfer(self, reference: str) -> httpx.Response:
+        self._maybe_settle("transfer", reference)
+        with self._lock:
+            transfer = self.transfers.get(reference)
+            transfer = dict(transfer) if transfer else None
+        if transfer is None:
+            return _failed(404, "Transfer not found")
+        return _reply(200, "Transfer details", data=transfer)
+
+    def _list(self, request: httpx.Request, kind: str) -> httpx.Response:
+        page = request.url.params.get("page", "1")
+        if not page.isdigit() or int(page) < 1:
+            return _failed(400, {"page": ["The page must be at least 1."]})
+        page = int(page)
+        with self._lock:
+            items = list((self.transactions if kind == "transactions" else self.transfers).values())
+        items.reverse()  # newest first
+        last_page = max(1, -(-len(items) // self.page_size))
+        start = (page - 1) * self.page_size
+        items = [dict(item) for item in items[start:start + self.page_size]]
+
+        url = str(request.url.copy_remove_param("page"))
+        separator = "&" if "?" in url else "?"
+        pagination = {
+            "per_page": self.page_size,
+            "current_page": page,
+            "first_page_url": f"{url}{separator}page=1",
+            "next_page_url": f"{url}{separator}page={page + 1}" if page < last_page else None,
+            "prev_page_url": f"{url}{separator}page={page - 1}" if page > 1 else None,
+        }
+        # the transaction list nests its page info, the transfer list is Laravel style
+        if kind == "transactions":
+            return _reply(200, "Transaction retrieved",
+                          data={"transactions": items, "pagination": pagination})
+        return httpx.Response(200, json={
+            "message": "Transfer details fetched",
+            "status": "success",
+            "data": items,
+            "meta": {**pagination, "last_page": last_page, "total": len(self.transfers)},
+        })
+
+    def _subaccount(self, data: Dict[str, Any]) -> httpx.Response:
+        required = ("business_name", "account_name", "bank_code", "account_number",
+                    "split_value", "split_type")
+        errors = {name: [f"The {name} field is required."] for name in required if not data.get(name)}
+        if data.get("split_type") and data["split_type"] not in ("flat", "percentage"):
+            errors["split_type"] = ["The selected split type is invalid."]
+        if errors:
+            return _failed(400, errors)
+        subaccount_id = str(uuid.uuid4())
+        with self._lock:
+            self.subaccounts[subaccount_id] = dict(data)
+        return _reply(200, "Subaccount created succesfully", data={"subaccounts[id]": subaccount_id})
+
+    def _maybe_settle(self, kind: str, reference: str) -> None:
+        if self.settle_after is None:
+            return
+        created = self._created.get(f"{kind}:{reference}")
+        if created is not None and time.monotonic() - created >= self.settle_after:
+            status = "success" if self._random.random() < self.success_rate else "failed"
+            self.settle(kind, reference, status)
+
+    def settle(self, kind: str, reference: str, status: str = "success") -> bool:
+        """
+        Move a pending transaction or transfer to a final status and emit its webhook
+
+        Args:
+            kind (str): 'transaction' or 'transfer'
+            reference (str): tx_ref of the transaction or reference of the transfer
+            status (str, optional): final status. Defaults to 'success'.
+
+        Returns:
+            bool: True if the item was pending
+        """
+        items = self.transactions if kind == "transaction" else self.transfers
+        with self._lock:
+            item = items.get(reference)
+            if item is None or item["status"] != "pending":
+                return False
+            item["status"] = status
+            item["updated_at"] = _now()
+            self._created.pop(f"{kind}:{reference}", None)
+            payload = dict(item)
+
+        prefix = "charge" if kind == "transaction" else "transfer"
+        event = f"{prefix}.{status}"
+        if event not in WEBHOOKS_EVENT_DESCRIPTION:
+            event = f"{prefix}.failed"
+        self.emit_webhook(event, payload)
+        return True
+
+    def emit_webhook(self, event: str, payload: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Sign a webhook and hand it to ``on_webhook``
+
+        Args:
+            event (str): event name
+            payload (dict): event data
+
+        Returns:
+            bytes: the raw body, None when there is no ``on_webhook``
+        """
+        if self.on_webhook is None:
+            return None
+        body = json.dumps({"event": event, **payload}).encode()
+        signature = self._verifier.signature(body)
+        self.on_webhook(body, {"Chapa-Signature": signature, "x-chapa-signature": signature})
+        return body
@@ -0,0 +1,150 @@
+"""
+Stores remembering which webhook events were already processed
+"""
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from ._sqlite import SQLiteConnection
+
+
+DEFAULT_IDEMPOTENCY_TTL = 24 * 3600.0
+
+
+class IdempotencyStore(ABC):
+    """
+    Set of recently seen keys.
+
+    Implement ``add`` and ``discard`` to share the deduplication between
+    processes through another store. The async versions run them on a worker
+    thread so a slow store never blocks the event loop, override them with a
+    native async implementation if there is one.
+    """
+
+    @abstractmethod
+    def add(self, key: str) -> bool:
+        """
+        Remember ``key``
+
+        Args:
+            key (str): fingerprint of the event
+
+        Returns:
+            bool: True if the key is new, False if it was already seen
+        """
+
+    @abstractmethod
+    def discard(self, key: str) -> None:
+        """Forget ``key`` so the event is processed again next time"""
+
+    async def add_async(self, key: str) -> bool:
+        """Async version of ``add``, run on a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.add, key)
+
+    async def discard_async(self, key: str) -> None:
+        """Async version of ``discard``, run on a worker thread"""
+        await asyncio.get_running_loop().run_in_executor(None, self.discard, key)
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """In-process LRU of seen keys, each expiring after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int = 100_000, ttl: float = DEFAULT_IDEMPOTENCY_TTL):
+        """
+        Args:
+            maxsize (int, optional): maximum keys remembered. Defaults to 100000.
+            ttl (float, optional): seconds a key is remembered. Defaults to one day.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._keys: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expires = self._keys.get(key)
+            if expires is not None and expires > now:
+                self._keys.move_to_end(key)
+                return False
+            self._keys[key] = now + self.ttl
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+            return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._keys.pop(key, None)
+
+    async def add_async(self, key: str) -> bool:
+        # never waits on anything but a short in-memory lock
+        return self.add(key)
+
+    async def discard_async(self, key: str) -> None:
+        self.discard(key)
+
+
+class SQLiteIdempotencyStore(IdempotencyStore):
+    """
+    Seen keys stored in a local SQLite file.
+
+    Every worker process on the host pointing at the same file shares the
+    deduplication.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_IDEMPOTENCY_TTL,
+        timeout: float = 30.0,
+        purge_every: int = 1000,
+    ):
+        """
+        Args:
+            path (str): database file, created if missing
+            ttl (float, optional): seconds a key is remembered. Defaults to one day.
+            timeout (float, optional): seconds to wait for the database lock. Defaults to 30.
+            purge_every (int, optional): expired keys are deleted every this many
+                                         additions. Defaults to 1000.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.timeout = timeout
+        self.purge_every = purge_every
+        self._adds = 0
+        self._lock = threading.Lock()
+        self._database = SQLiteConnection(
+            path,
+            timeout,
+            [
+                "CREATE TABLE IF NOT EXISTS chapa_webhook_keys "
+                "(key TEXT PRIMARY KEY, expires REAL NOT NULL)"
+            ],
+        )
+
+    def add(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            connection = self._database.get()
+            self._adds += 1
+            if self._adds % self.purge_every == 0:
+                connection.execute("DELETE FROM chapa_webhook_keys WHERE expires <= ?", (now,))
+            cursor = connection.execute(
+                "INSERT INTO chapa_webhook_keys (key, expires) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET expires = excluded.expires "
+                "WHERE chapa_webhook_keys.expires <= ?",
+                (key, now + self.ttl, now),
+            )
+            return cursor.rowcount == 1
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._database.get().execute("DELETE FROM chapa_webhook_keys WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._database.close()
@@ -0,0 +1,333 @@
+"""
+Instrumentation hooks and in-process metrics for requests sent to the Chapa API
+"""
+import threading
+import weakref
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Name of the endpoint of a url, without the api version and references
+
+    Example:
+        https://api.chapa.co/v1/transaction/verify/tx-1 -> transaction/verify
+
+    Args:
+        url (str): request url
+
+    Returns:
+        str: the endpoint name
+    """
+    parts = urlsplit(url).path.strip("/").split("/")
+    if parts and parts[0][:1] == "v" and parts[0][1:].isdigit():
+        parts = parts[1:]
+    if "verify" in parts:
+        parts = parts[: parts.index("verify") + 1]
+    return "/".join(parts)
+
+
+def pool_stats(client: Any) -> Optional[Dict[str, int]]:
+    """
+    Connection pool statistics of an httpx client
+
+    httpx does not expose its pool publicly, so this is best effort and
+    returns None when the transport is not the default one.
+
+    Args:
+        client (httpx.Client | httpx.AsyncClient): the client
+
+    Returns:
+        dict: 'connections', 'idle' and 'active' connection counts
+    """
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return None
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {"connections": len(connections), "idle": idle, "active": len(connections) - idle}
+
+
+class Instrumentation:
+    """
+    Hooks called around every request attempt.
+
+    Subclass it and override the hooks you need, then pass the instance as
+    the ``instrumentation`` of ``Chapa``/``AsyncChapa``. Hooks run inline
+    in the request path and must be fast.
+    """
+
+    def attach(self, chapa: Any) -> None:
+        """Called when a client starts using this instrumentation"""
+
+    def on_request_start(self, method: str, endpoint: str) -> None:
+        """Called before a request attempt is sent"""
+
+    def on_request_end(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration: float,
+        bytes_sent: int,
+        bytes_received: int,
+    ) -> None:
+        """Called when a response is received"""
+
+    def on_request_error(
+        self, method: str, endpoint: str, error: BaseException, duration: float
+    ) -> None:
+        """Called when a request attempt raises"""
+
+    def on_retry(self, method: str, endpoint: str, attempt: int, delay: float) -> None:
+        """Called before retry number ``attempt`` (starting at 1)"""
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+class MetricsCollector(Instrumentation):
+    """
+    In-process metrics: per endpoint latency histograms, status code,
+    error and retry counters, bytes sent and received, and the connection
+    pool of the attached clients.
+
+    Example:
+        metrics = MetricsCollector()
+        chapa = Chapa("secret", instrumentation=metrics)
+        ...
+        print(metrics.prometheus())
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (Tuple[float, ...], optional): upper bounds of the latency histogram
+                                                   buckets in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._clients = weakref.WeakSet()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every recorded metric"""
+        with self._lock:
+            self.latency: Dict[Tuple[str, str], _Histogram] = {}
+            self.responses: Dict[Tuple[str, str, int], int] = defaultdict(int)
+            self.errors: Dict[Tuple[str, str, str], int] = defaultdict(int)
+            self.retries: Dict[Tuple[str, str], int] = defaultdict(int)
+            self.bytes_sent: Dict[str, int] = defaultdict(int)
+            self.bytes_received: Dict[str, int] = defaultdict(int)
+            self.in_flight = 0
+
+    def attach(self, chapa: Any) -> None:
+        self._clients.add(chapa)
+
+    def _observe(self, method: str, endpoint: str, duration: float) -> None:
+        histogram = self.latency.get((method, endpoint))
+        if histogram is None:
+            histogram = self.latency[(method, endpoint)] = _Histogram(len(self.buckets) + 1)
+        histogram.counts[bisect_left(self.buckets, duration)] += 1
+        histogram.total += duration
+        histogram.count += 1
+
+    def on_request_start(self, method: str, endpoint: str) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def on_request_end(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration: float,
+        bytes_sent: int,
+        bytes_received: int,
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._observe(method, endpoint, duration)
+            self.responses[(method, endpoint, status_code)] += 1
+            self.bytes_sent[endpoint] += bytes_sent
+            self.bytes_received[endpoint] += bytes_received
+
+    def on_request_error(
+        self, method: str, endpoint: str, error: BaseException, duration: float
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._observe(method, endpoint, duration)
+            self.errors[(method, endpoint, type(error).__name__)] += 1
+
+    def on_retry(self, method: str, endpoint: str, attempt: int, delay: float) -> None:
+        with self._lock:
+            self.retries[(method, endpoint)] += 1
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Connection pool statistics summed over the attached clients"""
+        totals = {"connections": 0, "idle": 0, "active": 0}
+        for chapa in list(self._clients):
+            for client in getattr(chapa, "clients", ()):
+                for key, value in (pool_stats(client) or {}).items():
+                    totals[key] += value
+        return totals
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current metrics as plain data
+
+        Returns:
+            dict: latency (count, sum and bucket counts per method and endpoint),
+                  responses, errors, retries, bytes, in-flight requests and pool stats
+        """
+        with self._lock:
+            latency = {
+                f"{method} {endpoint}": {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "buckets": dict(zip(self.buckets + (float("inf"),), histogram.counts)),
+                }
+                for (method, endpoint), histogram in self.latency.items()
+            }
+            data = {
+                "latency": latency,
+                "responses": dict(self.responses),
+                "errors": dict(self.errors),
+                "retries": dict(self.retries),
+                "bytes_sent": dict(self.bytes_sent),
+                "bytes_received": dict(self.bytes_received),
+                "in_flight": self.in_flight,
+            }
+        data["pool"] = self.pool_stats()
+        return data
+
+    def prometheus(self, prefix: str = "chapa") -> str:
+        """
+        Export the metrics in the Prometheus text exposition format
+
+        Args:
+            prefix (str, optional): metric name prefix. Defaults to 'chapa'.
+
+        Returns:
+            str: the metrics page
+        """
+        lines: List[str] = []
+        with self._lock:
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} Duration of requests sent to the Chapa API.")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, endpoint), histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _labels(method=method, endpoint=endpoint, le=le)
+                    lines.append(f"{name}_bucket{{{labels}}} {cumulative}")
+                labels = _labels(method=method, endpoint=endpoint)
+                lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            counters = [
+                ("responses_total", "Responses by status code.", self.responses,
+                 ("method", "endpoint", "status")),
+                ("request_errors_total", "Requests that raised.", self.errors,
+                 ("method", "endpoint", "error")),
+                ("retries_total", "Retried requests.", self.retries, ("method", "endpoint")),
+                ("bytes_sent_total", "Request body bytes.", self.bytes_sent, ("endpoint",)),
+                ("bytes_received_total", "Response body bytes.", self.bytes_received,
+                 ("endpoint",)),
+            ]
+            for suffix, description, values, label_names in counters:
+                name = f"{prefix}_{suffix}"
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(values.items()):
+                    key = key if isinstance(key, tuple) else (key,)
+                    labels = _labels(**dict(zip(label_names, key)))
+                    lines.append(f"{name}{{{labels}}} {value}")
+
+            name = f"{prefix}_requests_in_flight"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {self.in_flight}")
+
+        for state, value in self.pool_stats().items():
+            name = f"{prefix}_pool_{state}"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Record the request metrics with OpenTelemetry.
+
+    Requires the ``opentelemetry-api`` package.
+    """
+
+    def __init__(self, meter_provider: Any = None):
+        """
+        Args:
+            meter_provider (MeterProvider, optional): provider of the meter. Defaults to
+                                                      the global provider.
+
+        Raises:
+            ImportError: If opentelemetry is not installed.
+        """
+        try:
+            from opentelemetry import metrics  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError(
+                "OpenTelemetryInstrumentation requires 'pip install opentelemetry-api'"
+            ) from error
+
+        meter = metrics.get_meter("chapa", meter_provider=meter_provider)
+        self.duration = meter.create_histogram(
+            "chapa.request.duration", unit="s", description="Duration of Chapa API requests"
+        )
+        self.responses = meter.create_counter("chapa.responses", description="Responses")
+        self.errors = meter.create_counter("chapa.request.errors", description="Failed requests")
+        self.retries = meter.create_counter("chapa.retries", description="Retried requests")
+        self.bytes_sent = meter.create_counter("chapa.bytes_sent", unit="By")
+        self.bytes_received = meter.create_counter("chapa.bytes_received", unit="By")
+
+    def on_request_end(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int,
+        duration: float,
+        bytes_sent: int,
+        bytes_received: int,
+    ) -> None:
+        attributes = {"method": method, "endpoint": endpoint}
+        self.duration.record(duration, attributes)
+        self.responses.add(1, {**attributes, "status": status_code})
+        self.bytes_sent.add(bytes_sent, {"endpoint": endpoint})
+        self.bytes_received.add(bytes_received, {"endpoint": endpoint})
+
+    def on_request_error(
+        self, method: str, endpoint: str, error: BaseException, duration: float
+    ) -> None:
+        attributes = {"method": method, "endpoint": endpoint}
+        self.duration.record(duration, attributes)
+        self.errors.add(1, {**attributes, "error": type(error).__name__})
+
+    def on_retry(self, method: str, endpoint: str, attempt: int, delay: float) -> None:
+        self.retries.add(1, {"method": method, "endpoint": endpoint})
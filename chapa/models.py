@@ -0,0 +1,246 @@
+"""
+Typed response models used by ``response_format="model"``
+"""
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type, TypeVar, Union
+
+
+M = TypeVar("M", bound="Model")
+
+
+class Model:
+    """
+    Base class of the slotted response models.
+
+    Fields are the ``__slots__`` of the subclass. Keys of the payload that
+    are not a field are kept in ``extra`` so nothing sent by Chapa is lost.
+    """
+
+    __slots__ = ("extra",)
+    _fields: Tuple[str, ...] = ()
+    _field_set: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            field
+            for klass in reversed(cls.__mro__)
+            for field in klass.__dict__.get("__slots__", ())
+            if field != "extra"
+        )
+        cls._field_set = frozenset(cls._fields)
+
+    def __init__(self, **fields):
+        for field in self._fields:
+            setattr(self, field, fields.pop(field, None))
+        self.extra = fields or None
+
+    @classmethod
+    def from_dict(cls: Type[M], data: Dict[str, Any]) -> M:
+        """
+        Decode a model from a JSON payload
+
+        Args:
+            data (dict): the parsed payload
+
+        Returns:
+            Model: the decoded model
+        """
+        obj = cls.__new__(cls)
+        get = data.get
+        for field in cls._fields:
+            setattr(obj, field, get(field))
+        field_set = cls._field_set
+        extra = {key: value for key, value in data.items() if key not in field_set}
+        obj.extra = extra or None
+        return obj
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the model as a plain dict, including the extra keys"""
+        data = {field: getattr(self, field) for field in self._fields}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class CheckoutSession(Model):
+    """Data of a successful ``initialize`` response"""
+
+    __slots__ = ("checkout_url",)
+    checkout_url: Optional[str]
+
+
+class TransactionVerification(Model):
+    """Data of a ``verify`` response"""
+
+    __slots__ = (
+        "first_name",
+        "last_name",
+        "email",
+        "currency",
+        "amount",
+        "charge",
+        "mode",
+        "method",
+        "type",
+        "status",
+        "reference",
+        "tx_ref",
+        "customization",
+        "meta",
+        "created_at",
+        "updated_at",
+    )
+    first_name: Optional[str]
+    last_name: Optional[str]
+    email: Optional[str]
+    currency: Optional[str]
+    amount: Union[str, float, None]
+    charge: Union[str, float, None]
+    mode: Optional[str]
+    method: Optional[str]
+    type: Optional[str]
+    status: Optional[str]
+    reference: Optional[str]
+    tx_ref: Optional[str]
+    customization: Optional[dict]
+    meta: Optional[dict]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+class TransferStatus(Model):
+    """Data of a ``verify_transfer`` response"""
+
+    __slots__ = (
+        "account_name",
+        "account_number",
+        "mobile",
+        "currency",
+        "amount",
+        "charge",
+        "mode",
+        "transfer_method",
+        "narration",
+        "chapa_transfer_id",
+        "bank_code",
+        "bank_name",
+        "cross_party_reference",
+        "ip_address",
+        "status",
+        "tx_ref",
+        "created_at",
+        "updated_at",
+    )
+    account_name: Optional[str]
+    account_number: Optional[str]
+    mobile: Optional[str]
+    currency: Optional[str]
+    amount: Union[str, float, None]
+    charge: Union[str, float, None]
+    mode: Optional[str]
+    transfer_method: Optional[str]
+    narration: Optional[str]
+    chapa_transfer_id: Optional[str]
+    bank_code: Union[str, int, None]
+    bank_name: Optional[str]
+    cross_party_reference: Optional[str]
+    ip_address: Optional[str]
+    status: Optional[str]
+    tx_ref: Optional[str]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+class Bank(Model):
+    """An item of the ``get_banks`` response"""
+
+    __slots__ = (
+        "id",
+        "slug",
+        "swift",
+        "name",
+        "acct_length",
+        "country_id",
+        "currency",
+        "is_mobilemoney",
+        "is_active",
+        "is_rtgs",
+        "active",
+        "is_24hrs",
+        "created_at",
+        "updated_at",
+    )
+    id: Optional[int]
+    slug: Optional[str]
+    swift: Optional[str]
+    name: Optional[str]
+    acct_length: Optional[int]
+    country_id: Optional[int]
+    currency: Optional[str]
+    is_mobilemoney: Optional[int]
+    is_active: Optional[int]
+    is_rtgs: Optional[int]
+    active: Optional[int]
+    is_24hrs: Optional[int]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+class Subaccount(Model):
+    """Data of a ``create_subaccount`` response"""
+
+    __slots__ = ("id",)
+    id: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Subaccount":
+        # Chapa returns the id as "subaccounts[id]"
+        if "id" not in data and "subaccounts[id]" in data:
+            data = dict(data)
+            data["id"] = data.pop("subaccounts[id]")
+        return super().from_dict(data)
+
+
+class ApiResponse(Model):
+    """Envelope of every Chapa response, ``data`` is decoded to a model when possible"""
+
+    __slots__ = ("message", "status", "data")
+    message: Any
+    status: Optional[str]
+    data: Union[Model, List[Model], Any]
+
+
+def decode(payload: Any, model: Optional[Type[Model]] = None) -> Any:
+    """
+    Decode a raw response into an ApiResponse
+
+    Args:
+        payload (Any): the parsed response body
+        model (Type[Model], optional): model of the ``data`` field, or of each
+                                       item when ``data`` is a list
+
+    Returns:
+        ApiResponse: the decoded response, ``payload`` itself if it is not a dict
+    """
+    if not isinstance(payload, dict):
+        return payload
+
+    response = ApiResponse.from_dict(payload)
+    data = response.data
+    if model is not None:
+        if isinstance(data, dict):
+            response.data = model.from_dict(data)
+        elif isinstance(data, list):
+            response.data = [
+                model.from_dict(item) if isinstance(item, dict) else item for item in data
+            ]
+    return response
@@ -0,0 +1,268 @@
+"""
+Crash-safe journal of the transactions and transfers sent to Chapa
+"""
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ._sqlite import SQLiteConnection
+
+
+OUTBOX_KINDS = ("transaction", "transfer")
+
+
+class OutboxEntry(NamedTuple):
+    """A journaled ``initialize`` (kind 'transaction') or ``transfer_to_bank`` call"""
+
+    kind: str
+    reference: str
+    payload: Dict[str, Any]
+    result: Optional[str]
+    created: float
+
+
+class _Batch:
+    __slots__ = ("operations", "done", "error")
+
+    def __init__(self):
+        self.operations: List[Tuple[str, tuple]] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class Outbox:
+    """
+    Journal in a local SQLite file of every payment sent to Chapa.
+
+    Each ``initialize``/``transfer_to_bank`` call is recorded, keyed by its
+    ``tx_ref``/``reference``, before the request is sent, and resolved once
+    Chapa answers. If the process dies in between, the entry stays
+    unresolved and ``Chapa.replay_outbox`` verifies it after the restart.
+
+    Writes are group committed: threads recording at the same time share a
+    single transaction. Coroutines use ``record_async``, which commits on a
+    worker thread so that concurrent calls of an event loop are grouped too.
+    The database runs in WAL mode with ``synchronous=NORMAL`` by default,
+    which survives a crash of the process but may lose the last commits on
+    power loss, pass ``durable=True`` to sync every commit to disk.
+
+    Example:
+        outbox = Outbox("chapa-outbox.db")
+        chapa = Chapa("secret", outbox=outbox)
+        for result in chapa.replay_outbox():
+            print(result.reference, result.status)
+    """
+
+    def __init__(self, path: str, durable: bool = False, timeout: float = 30.0):
+        """
+        Args:
+            path (str): database file, created if missing
+            durable (bool, optional): sync every commit to disk. Defaults to False.
+            timeout (float, optional): seconds to wait for the database lock. Defaults to 30.
+        """
+        self.path = path
+        self.durable = durable
+        self.timeout = timeout
+        self._lock = threading.Condition()
+        self._db_lock = threading.Lock()
+        self._batch: Optional[_Batch] = None
+        self._flushing = False
+        self._database = SQLiteConnection(
+            path,
+            timeout,
+            [
+                "PRAGMA journal_mode=WAL",
+                f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}",
+                "CREATE TABLE IF NOT EXISTS chapa_outbox ("
+                "kind TEXT NOT NULL, reference TEXT NOT NULL, payload TEXT NOT NULL, "
+                "result TEXT, created REAL NOT NULL, updated REAL NOT NULL, "
+                "PRIMARY KEY (kind, reference))",
+                "CREATE INDEX IF NOT EXISTS chapa_outbox_unresolved "
+                "ON chapa_outbox (created) WHERE result IS NULL",
+            ],
+        )
+
+    def _enqueue(self, sql: str, parameters: tuple) -> _Batch:
+        with self._lock:
+            if self._batch is None:
+                self._batch = _Batch()
+            self._batch.operations.append((sql, parameters))
+            return self._batch
+
+    def _commit(self, batch: Optional[_Batch] = None) -> None:
+        """
+        Wait until ``batch`` (or everything enqueued so far) is committed
+
+        The first waiting thread commits every enqueued operation in one
+        transaction while the others wait for it.
+        """
+        with self._lock:
+            if batch is None:
+                batch = self._batch
+                while batch is None and self._flushing:
+                    self._lock.wait()
+            while batch is not None and not batch.done:
+                if self._flushing:
+                    self._lock.wait()
+                    continue
+                current, self._batch = self._batch, None
+                self._flushing = True
+                self._lock.release()
+                try:
+                    self._write(current)
+                finally:
+                    self._lock.acquire()
+                    current.done = True
+                    self._flushing = False
+                    self._lock.notify_all()
+            if batch is not None and batch.error is not None:
+                raise batch.error
+
+    def _write(self, batch: _Batch) -> None:
+        with self._db_lock:
+            try:
+                connection = self._database.get()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    for sql, parameters in batch.operations:
+                        connection.execute(sql, parameters)
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                connection.execute("COMMIT")
+            except Exception as error:  # pylint: disable=broad-except
+                batch.error = error
+
+    def record(self, kind: str, reference: str, payload: Dict[str, Any]) -> None:
+        """
+        Journal a call before it is sent, returns once the entry is committed
+
+        Recording a reference again marks it unresolved again.
+
+        Args:
+            kind (str): 'transaction' or 'transfer'
+            reference (str): tx_ref of the transaction or reference of the transfer
+            payload (dict): request body
+
+        Raises:
+            ValueError: If the kind is unknown.
+            sqlite3.Error: If the entry could not be written.
+        """
+        if kind not in OUTBOX_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(OUTBOX_KINDS)}")
+        now = time.time()
+        batch = self._enqueue(
+            "INSERT INTO chapa_outbox VALUES (?, ?, ?, NULL, ?, ?) "
+            "ON CONFLICT (kind, reference) DO UPDATE SET "
+            "payload = excluded.payload, result = NULL, updated = excluded.updated",
+            (kind, reference, json.dumps(payload, default=str), now, now),
+        )
+        self._commit(batch)
+
+    async def record_async(self, kind: str, reference: str, payload: Dict[str, Any]) -> None:
+        """
+        Async version of ``record``, the event loop is not blocked by the commit
+
+        Args:
+            kind (str): 'transaction' or 'transfer'
+            reference (str): tx_ref of the transaction or reference of the transfer
+            payload (dict): request body
+
+        Raises:
+            ValueError: If the kind is unknown.
+            sqlite3.Error: If the entry could not be written.
+        """
+        if kind not in OUTBOX_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(OUTBOX_KINDS)}")
+        now = time.time()
+        batch = self._enqueue(
+            "INSERT INTO chapa_outbox VALUES (?, ?, ?, NULL, ?, ?) "
+            "ON CONFLICT (kind, reference) DO UPDATE SET "
+            "payload = excluded.payload, result = NULL, updated = excluded.updated",
+            (kind, reference, json.dumps(payload, default=str), now, now),
+        )
+        await asyncio.get_running_loop().run_in_executor(None, self._commit, batch)
+
+    def complete(self, kind: str, reference: str, result: str) -> None:
+        """
+        Resolve an entry with the outcome of its call
+
+        The update is committed with the next group of writes (or by
+        ``flush``) without waiting: losing it only means the entry is
+        verified again by the next replay.
+
+        Args:
+            kind (str): 'transaction' or 'transfer'
+            reference (str): tx_ref of the transaction or reference of the transfer
+            result (str): outcome, e.g. 'accepted', 'rejected' or the verified status
+        """
+        self._enqueue(
+            "UPDATE chapa_outbox SET result = ?, updated = ? WHERE kind = ? AND reference = ?",
+            (result, time.time(), kind, reference),
+        )
+
+    def flush(self) -> None:
+        """Commit every pending write"""
+        self._commit()
+
+    async def flush_async(self) -> None:
+        """Async version of ``flush``, committed on a worker thread"""
+        await asyncio.get_running_loop().run_in_executor(None, self._commit)
+
+    def unresolved(self, kind: Optional[str] = None) -> List[OutboxEntry]:
+        """
+        Entries whose outcome is unknown, oldest first
+
+        Args:
+            kind (str, optional): 'transaction' or 'transfer'. Defaults to both.
+
+        Returns:
+            List[OutboxEntry]: the unresolved entries
+        """
+        self.flush()
+        sql = "SELECT kind, reference, payload, result, created FROM chapa_outbox WHERE result IS NULL"
+        parameters: tuple = ()
+        if kind is not None:
+            sql += " AND kind = ?"
+            parameters = (kind,)
+        with self._db_lock:
+            rows = self._database.get().execute(sql + " ORDER BY created", parameters).fetchall()
+        return [
+            OutboxEntry(kind, reference, json.loads(payload), result, created)
+            for kind, reference, payload, result, created in rows
+        ]
+
+    def get(self, kind: str, reference: str) -> Optional[OutboxEntry]:
+        """Return the entry of a reference, None if it was never recorded"""
+        self.flush()
+        with self._db_lock:
+            row = self._database.get().execute(
+                "SELECT kind, reference, payload, result, created FROM chapa_outbox "
+                "WHERE kind = ? AND reference = ?",
+                (kind, reference),
+            ).fetchone()
+        if row is None:
+            return None
+        return OutboxEntry(row[0], row[1], json.loads(row[2]), row[3], row[4])
+
+    def purge(self, max_age: float) -> None:
+        """
+        Delete the resolved entries older than ``max_age`` seconds
+
+        Args:
+            max_age (float): age in seconds
+        """
+        self.flush()
+        with self._db_lock:
+            self._database.get().execute(
+                "DELETE FROM chapa_outbox WHERE result IS NOT NULL AND updated <= ?",
+                (time.time() - max_age,),
+            )
+
+    def close(self) -> None:
+        """Commit the pending writes and close the database connection"""
+        self.flush()
+        with self._db_lock:
+            self._database.close()
@@ -0,0 +1,195 @@
+"""
+Lazy walk of the paginated list endpoints with background page prefetch
+"""
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+
+DEFAULT_PREFETCH = 1
+
+# a page is requested by number, or by the url given by the previous page
+PageToken = Union[int, str]
+
+_END = object()
+
+
+def page_items(response: Any, key: Optional[str] = None) -> List[Any]:
+    """
+    Items of a page of a list endpoint
+
+    The items are either the ``data`` list itself or a list inside
+    ``data`` (``data[key]``, or its ``data`` for Laravel style pages).
+
+    Args:
+        response (dict): raw page response
+        key (str, optional): name of the list inside ``data``, e.g. 'transactions'
+
+    Returns:
+        list: the items, empty if the page has none
+    """
+    data = response.get("data") if isinstance(response, dict) else None
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for name in (key, "data"):
+            if name and isinstance(data.get(name), list):
+                return data[name]
+    return []
+
+
+def _page_info(response: Any) -> dict:
+    if not isinstance(response, dict):
+        return {}
+    data = response.get("data")
+    for info in (
+        response.get("meta"),
+        response.get("pagination"),
+        data.get("pagination") if isinstance(data, dict) else None,
+        data.get("meta") if isinstance(data, dict) else None,
+        data if isinstance(data, dict) else None,
+    ):
+        if isinstance(info, dict) and ("next_page_url" in info or "last_page" in info):
+            return info
+    return {}
+
+
+def next_page(response: Any, page: int, key: Optional[str] = None) -> Optional[PageToken]:
+    """
+    Token of the page following ``page``, None on the last page
+
+    ``next_page_url`` is followed when the page gives one, otherwise the
+    page number is incremented until ``last_page`` or an empty page.
+
+    Args:
+        response (dict): raw page response
+        page (int): number of the page
+        key (str, optional): name of the list inside ``data``
+
+    Returns:
+        int | str: number or url of the next page, None if there is none
+    """
+    if not page_items(response, key):
+        return None
+    info = _page_info(response)
+    if "next_page_url" in info:
+        url = info["next_page_url"]
+        if not url:
+            return None
+        number = parse_qs(urlsplit(url).query).get("page")
+        return int(number[0]) if number and number[0].isdigit() else url
+    last_page = info.get("last_page")
+    if last_page is not None and page >= int(last_page):
+        return None
+    return page + 1
+
+
+def iter_pages(
+    fetch: Callable[[PageToken], Any],
+    key: Optional[str] = None,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> Iterator[Any]:
+    """
+    Fetch the pages of a list endpoint one after the other on a background thread
+
+    While the caller consumes a page, the following ones are fetched, but
+    at most ``prefetch`` pages wait in memory.
+
+    Args:
+        fetch (Callable): returns the raw response of a page number or url
+        key (str, optional): name of the list inside ``data``
+        prefetch (int, optional): pages fetched ahead of the caller. Defaults to 1.
+
+    Yields:
+        dict: the raw response of every page, in order
+    """
+    if not isinstance(prefetch, int) or prefetch < 1:
+        raise ValueError("prefetch must be a positive integer")
+    pages: "queue.Queue" = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        token: Optional[PageToken] = 1
+        page = 1
+        try:
+            while token is not None and not stop.is_set():
+                response = fetch(token)
+                if not put(response):
+                    return
+                page = token if isinstance(token, int) else page + 1
+                token = next_page(response, page, key)
+        except BaseException as error:  # pylint: disable=broad-except
+            put(error)
+            return
+        put(_END)
+
+    producer = threading.Thread(target=produce, name="chapa-page-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+async def iter_pages_async(
+    fetch: Callable[[PageToken], Awaitable[Any]],
+    key: Optional[str] = None,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> AsyncIterator[Any]:
+    """
+    Async version of ``iter_pages``, the pages are fetched by a background task
+
+    Args:
+        fetch (Callable): coroutine function returning the raw response of a page number or url
+        key (str, optional): name of the list inside ``data``
+        prefetch (int, optional): pages fetched ahead of the caller. Defaults to 1.
+
+    Yields:
+        dict: the raw response of every page, in order
+    """
+    if not isinstance(prefetch, int) or prefetch < 1:
+        raise ValueError("prefetch must be a positive integer")
+    pages: "asyncio.Queue" = asyncio.Queue(maxsize=prefetch)
+
+    async def produce():
+        token: Optional[PageToken] = 1
+        page = 1
+        try:
+            while token is not None:
+                response = await fetch(token)
+                await pages.put(response)
+                page = token if isinstance(token, int) else page + 1
+                token = next_page(response, page, key)
+        except Exception as error:  # pylint: disable=broad-except
+            await pages.put(error)
+            return
+        await pages.put(_END)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await pages.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
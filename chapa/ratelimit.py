@@ -0,0 +1,219 @@
+"""
+Client-side token bucket rate limiting for requests sent to the Chapa API
+"""
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from ._sqlite import SQLiteConnection
+
+
+ENDPOINT_FAMILIES = ("initialize", "verify", "transfer", "default")
+
+Limit = Union[float, Tuple[float, float]]
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Classify a Chapa API url into an endpoint family
+
+    Args:
+        url (str): request url
+
+    Returns:
+        str: 'initialize', 'verify', 'transfer' or 'default'
+    """
+    path = urlsplit(url).path
+    if path.endswith("/transaction/initialize"):
+        return "initialize"
+    if "/verify/" in path:
+        return "verify"
+    if path.endswith("/transfer"):
+        return "transfer"
+    return "default"
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage of the token buckets.
+
+    Implement ``reserve`` to coordinate several processes through a shared
+    store (a Redis-compatible server for example). ``reserve_async`` runs
+    ``reserve`` on a worker thread so a slow store never blocks the event
+    loop, override it with a native async implementation if there is one.
+    """
+
+    @abstractmethod
+    def reserve(self, key: str, rate: float, capacity: float) -> float:
+        """
+        Take one token from the bucket ``key``
+
+        The bucket may go into debt, in which case the caller must wait for
+        the returned delay before sending its request.
+
+        Args:
+            key (str): bucket name
+            rate (float): tokens added per second
+            capacity (float): maximum tokens in the bucket (burst size)
+
+        Returns:
+            float: seconds to wait before the token can be used
+        """
+
+    async def reserve_async(self, key: str, rate: float, capacity: float) -> float:
+        """Async version of ``reserve``, run on a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.reserve, key, rate, capacity
+        )
+
+
+def _take(tokens: float, updated: float, now: float, rate: float, capacity: float) -> float:
+    """Refill the bucket up to ``now`` and take one token, returning the new balance"""
+    return min(capacity, tokens + (now - updated) * rate) - 1
+
+
+class MemoryBackend(RateLimitBackend):
+    """Token buckets shared by the threads and coroutines of one process."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, rate: float, capacity: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = _take(tokens, updated, now, rate, capacity)
+            self._buckets[key] = (tokens, now)
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    async def reserve_async(self, key: str, rate: float, capacity: float) -> float:
+        # never waits on anything but a short in-memory lock
+        return self.reserve(key, rate, capacity)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Token buckets stored in a local SQLite file.
+
+    Every worker process on the host pointing at the same file shares the
+    same buckets.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Args:
+            path (str): database file, created if missing
+            timeout (float, optional): seconds to wait for the database lock. Defaults to 30.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._database = SQLiteConnection(
+            path,
+            timeout,
+            [
+                "CREATE TABLE IF NOT EXISTS chapa_rate_limits "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            ],
+        )
+
+    def reserve(self, key: str, rate: float, capacity: float) -> float:
+        with self._lock:
+            connection = self._database.get()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = connection.execute(
+                    "SELECT tokens, updated FROM chapa_rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens = _take(tokens, updated, now, rate, capacity)
+                connection.execute(
+                    "INSERT OR REPLACE INTO chapa_rate_limits (key, tokens, updated) "
+                    "VALUES (?, ?, ?)",
+                    (key, tokens, now),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._database.close()
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter per endpoint family.
+
+    The families are 'initialize', 'verify' (transactions and transfers),
+    'transfer' and 'default' for every other endpoint. Families without a
+    configured limit are not limited.
+
+    Pass the same limiter to several ``Chapa``/``AsyncChapa`` instances to
+    share its budget, and use a shared backend such as ``SQLiteBackend`` to
+    coordinate several processes.
+
+    Example:
+        limiter = RateLimiter({"initialize": 10, "verify": (50, 100)})
+        chapa = Chapa("secret", rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Limit],
+        backend: Optional[RateLimitBackend] = None,
+        namespace: str = "chapa",
+    ):
+        """
+        Args:
+            limits (Dict[str, float | Tuple[float, float]]): requests per second per family,
+                or a (rate, burst) tuple. The burst defaults to the rate, at least 1.
+            backend (RateLimitBackend, optional): bucket storage. Defaults to MemoryBackend.
+            namespace (str, optional): prefix of the bucket keys in the backend. Defaults to 'chapa'.
+        """
+        self.limits: Dict[str, Tuple[float, float]] = {}
+        for family, limit in limits.items():
+            if family not in ENDPOINT_FAMILIES:
+                raise ValueError(f"unknown endpoint family {family}")
+            rate, burst = limit if isinstance(limit, tuple) else (limit, max(1.0, limit))
+            if rate <= 0 or burst < 1:
+                raise ValueError("rate must be positive and burst at least 1")
+            self.limits[family] = (float(rate), float(burst))
+        self.backend = backend or MemoryBackend()
+        self.namespace = namespace
+
+    def reserve(self, url: str) -> float:
+        """Take a token for ``url`` and return the seconds to wait before sending it."""
+        family = endpoint_family(url)
+        limit = self.limits.get(family)
+        if limit is None:
+            return 0.0
+        return self.backend.reserve(f"{self.namespace}:{family}", *limit)
+
+    async def reserve_async(self, url: str) -> float:
+        """Async version of ``reserve``, the backend is not queried on the event loop"""
+        family = endpoint_family(url)
+        limit = self.limits.get(family)
+        if limit is None:
+            return 0.0
+        return await self.backend.reserve_async(f"{self.namespace}:{family}", *limit)
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to ``url`` may be sent."""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, url: str) -> None:
+        """Sleep until a request to ``url`` may be sent."""
+        delay = await self.reserve_async(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,533 @@
+"""
+Reconciliation of an internal ledger against the transactions known by Chapa
+"""
+import csv
+import math
+import os
+import sys
+from itertools import islice
+from types import ModuleType
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .batch import DEFAULT_CONCURRENCY, run_async, run_threaded
+
+
+DEFAULT_BATCH_SIZE = 10_000
+
+RECONCILE_KINDS = ("transaction", "transfer")
+
+# cents of a missing or unparsable amount
+_NO_AMOUNT = -(2**63)
+
+
+class Discrepancy(NamedTuple):
+    """
+    A difference between the ledger and Chapa
+
+    ``kind`` is 'mismatch' (``fields`` lists the fields that differ),
+    'missing' (in the ledger, unknown to Chapa) or 'orphaned' (known to
+    Chapa, not in the ledger).
+    """
+
+    kind: str
+    reference: str
+    fields: Tuple[str, ...] = ()
+    ledger: Optional[Dict[str, Any]] = None
+    chapa: Optional[Dict[str, Any]] = None
+
+
+def _numpy():
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+def _pandas(reason: Optional[str] = None):
+    try:
+        import pandas  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        if reason:
+            raise ImportError(f"{reason} requires 'pip install pandas pyarrow'") from error
+        return None
+    return pandas
+
+
+def to_cents(amount: Any) -> int:
+    """
+    Amount in cents, e.g. '1,311.50' -> 131150
+
+    Args:
+        amount (int | float | str | Decimal): the amount
+
+    Returns:
+        int: the amount in cents, a sentinel if it is missing or invalid
+    """
+    if amount is None or isinstance(amount, bool):
+        return _NO_AMOUNT
+    try:
+        if isinstance(amount, str):
+            amount = amount.replace(",", "").strip()
+        value = float(amount)
+    except (TypeError, ValueError):
+        return _NO_AMOUNT
+    if not math.isfinite(value):
+        return _NO_AMOUNT
+    # amounts have at most two decimals, rounding absorbs the float error
+    return int(round(value * 100))
+
+
+def _cents_column(amounts: List[Any], np: Any) -> Any:
+    """``to_cents`` of a column of amounts, parsed by pandas when installed"""
+    pandas = _pandas()
+    if pandas is None:
+        return np.fromiter(map(to_cents, amounts), dtype=np.int64, count=len(amounts))
+    values = pandas.to_numeric(
+        pandas.Series(amounts, dtype=object).astype(str).str.replace(",", "", regex=False),
+        errors="coerce",
+    ).to_numpy(dtype=float)
+    cents = np.full(len(values), _NO_AMOUNT, dtype=np.int64)
+    valid = np.isfinite(values)
+    cents[valid] = np.rint(values[valid] * 100).astype(np.int64)
+    return cents
+
+
+def _as_dict(record: Any) -> Dict[str, Any]:
+    if isinstance(record, dict):
+        return record
+    to_dict = getattr(record, "to_dict", None)
+    return to_dict() if to_dict else {}
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+class Reconciler:
+    """
+    Ledger indexed by reference, compared against a stream of Chapa records.
+
+    The ledger columns are loaded once into flat arrays with a hash index
+    on the reference. Chapa records are then compared in batches: with
+    NumPy installed the amount, currency and status of a whole batch are
+    compared at once, otherwise in a plain loop. Amounts are compared in
+    cents, currencies case-insensitively and statuses lowercased, after
+    ``statuses`` maps the ledger statuses to Chapa's.
+
+    Example:
+        reconciler = Reconciler("ledger.csv")
+        for discrepancy in reconciler.feed(chapa.iter_transactions()):
+            print(discrepancy)
+        for discrepancy in reconciler.missing():
+            print(discrepancy)
+    """
+
+    def __init__(
+        self,
+        ledger: Any,
+        key: str = "tx_ref",
+        amount: str = "amount",
+        currency: str = "currency",
+        status: str = "status",
+        chapa_key: Optional[str] = None,
+        statuses: Optional[Dict[str, str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        vectorized: Optional[bool] = None,
+    ):
+        """
+        Args:
+            ledger (str | DataFrame | Iterable[dict]): path of a CSV or Parquet file, a pandas
+                                                       DataFrame or the rows as dicts
+            key (str, optional): reference column of the ledger. Defaults to 'tx_ref'.
+            amount (str, optional): amount column of the ledger. Defaults to 'amount'.
+            currency (str, optional): currency column of the ledger. Defaults to 'currency'.
+            status (str, optional): status column of the ledger. Defaults to 'status'.
+            chapa_key (str, optional): reference field of the Chapa records, 'tx_ref' for
+                                       transfers. Defaults to ``key``.
+            statuses (dict, optional): ledger status -> Chapa status. Defaults to None.
+            batch_size (int, optional): Chapa records compared at once. Defaults to 10000.
+            vectorized (bool, optional): compare with NumPy. Defaults to True if installed.
+
+        Raises:
+            ImportError: If the ledger is a Parquet file and pandas is not installed.
+            ValueError: If vectorized is True and NumPy is not installed.
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.key = key
+        self.columns = {"amount": amount, "currency": currency, "status": status}
+        self.chapa_key = chapa_key or key
+        self.statuses = {str(k).lower(): str(v).lower() for k, v in (statuses or {}).items()}
+        self.batch_size = batch_size
+        self._np = _numpy() if vectorized is not False else None
+        if vectorized and self._np is None:
+            raise ValueError("vectorized comparison requires 'pip install numpy'")
+        #: references repeated in the ledger, only their first row is reconciled
+        self.duplicates: List[str] = []
+        #: Chapa records without a reference, skipped
+        self.unkeyed = 0
+
+        references, amounts, currencies, ledger_statuses, cents = self._load(ledger)
+        self._references = references
+        self._amounts = amounts
+        # built backwards so the first row of a repeated reference wins
+        self._index: Dict[str, int] = dict(
+            zip(reversed(references), range(len(references) - 1, -1, -1))
+        )
+        if len(self._index) != len(references):
+            self.duplicates = [
+                reference
+                for position, reference in enumerate(references)
+                if self._index[reference] != position
+            ]
+
+        currencies = [("" if value is None else str(value)).upper() for value in currencies]
+        ledger_statuses = [
+            ("" if value is None else str(value)).lower() for value in ledger_statuses
+        ]
+        if self.statuses:
+            mapped = self.statuses.get
+            ledger_statuses = [mapped(value, value) for value in ledger_statuses]
+        if self._np is not None:
+            np = self._np
+            self._cents = np.asarray(cents, dtype=np.int64)
+            self._currencies = np.asarray(currencies, dtype=object)
+            self._statuses = np.asarray(ledger_statuses, dtype=object)
+            self._seen = np.zeros(len(references), dtype=bool)
+        else:
+            self._cents = cents
+            self._currencies = currencies
+            self._statuses = ledger_statuses
+            self._seen = bytearray(len(references))
+
+    def __len__(self):
+        return len(self._references)
+
+    def _load(self, ledger: Any):
+        """Read the ledger into (references, amounts, currencies, statuses, cents) columns"""
+        names = [self.key, *self.columns.values()]
+        if isinstance(ledger, (str, os.PathLike)):
+            path = os.fspath(ledger)
+            if path.lower().endswith((".parquet", ".pq")):
+                pandas = _pandas("reading a Parquet ledger")
+                return self._load_frame(pandas.read_parquet(path, columns=names))
+            pandas = _pandas()
+            if pandas is not None:
+                return self._load_frame(
+                    pandas.read_csv(path, usecols=names, dtype=str, keep_default_na=False)
+                )
+            with open(path, newline="", encoding="utf-8") as file:
+                return self._load_rows(csv.DictReader(file))
+        if hasattr(ledger, "columns") and hasattr(ledger, "iloc"):
+            return self._load_frame(ledger)
+        return self._load_rows(ledger)
+
+    def _load_rows(self, rows: Iterable[Any]):
+        references, amounts, currencies, statuses = [], [], [], []
+        amount, currency, status = self.columns.values()
+        for row in rows:
+            row = _as_dict(row)
+            references.append(_text(row.get(self.key)))
+            amounts.append(row.get(amount))
+            currencies.append(row.get(currency))
+            statuses.append(row.get(status))
+        return references, amounts, currencies, statuses, [to_cents(value) for value in amounts]
+
+    def _load_frame(self, frame: Any):
+        amount, currency, status = self.columns.values()
+        amounts = frame[amount].tolist()
+        if self._np is not None:
+            cents = _cents_column(amounts, self._np)
+        else:
+            cents = [to_cents(value) for value in amounts]
+        return (
+            ["" if value is None else str(value) for value in frame[self.key].tolist()],
+            amounts,
+            frame[currency].tolist(),
+            frame[status].tolist(),
+            cents,
+        )
+
+    def _ledger_row(self, position: int) -> Dict[str, Any]:
+        return {
+            self.key: self._references[position],
+            self.columns["amount"]: self._amounts[position],
+            self.columns["currency"]: self._currencies[position],
+            self.columns["status"]: self._statuses[position],
+        }
+
+    def feed(self, records: Iterable[Any]) -> Iterator[Discrepancy]:
+        """
+        Compare Chapa records with the ledger
+
+        Args:
+            records (Iterable[dict]): Chapa transactions or transfers, e.g. the
+                                      items of ``iter_transactions`` or the ``data``
+                                      of verify responses
+
+        Yields:
+            Discrepancy: the mismatched and orphaned records, batch after batch
+        """
+        records = iter(records)
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                return
+            yield from self._compare(batch)
+
+    async def feed_async(
+        self, records: Union[Iterable[Any], AsyncIterable[Any]]
+    ) -> AsyncIterator[Discrepancy]:
+        """Async version of ``feed``, accepting async iterables such as ``AsyncChapa.iter_transactions``"""
+        if not hasattr(records, "__aiter__"):
+            for discrepancy in self.feed(records):
+                yield discrepancy
+            return
+        batch = []
+        async for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                for discrepancy in self._compare(batch):
+                    yield discrepancy
+                batch = []
+        for discrepancy in self._compare(batch):
+            yield discrepancy
+
+    def _compare(self, batch: List[Any]) -> Iterator[Discrepancy]:
+        positions, matched = [], []
+        lookup = self._index.get
+        for record in batch:
+            if not isinstance(record, dict):
+                record = _as_dict(record)
+            reference = record.get(self.chapa_key)
+            reference = "" if reference is None else str(reference)
+            if not reference:
+                self.unkeyed += 1
+                continue
+            position = lookup(reference)
+            if position is None:
+                yield Discrepancy("orphaned", reference, chapa=record)
+            else:
+                positions.append(position)
+                matched.append(record)
+        if not matched:
+            return
+
+        currencies = [_text(record.get("currency")).upper() for record in matched]
+        statuses = [_text(record.get("status")).lower() for record in matched]
+
+        np = self._np
+        if np is not None:
+            index = np.asarray(positions, dtype=np.int64)
+            cents = _cents_column([record.get("amount") for record in matched], np)
+            amount_ok = self._cents[index] == cents
+            currency_ok = self._currencies[index] == np.asarray(currencies, dtype=object)
+            status_ok = self._statuses[index] == np.asarray(statuses, dtype=object)
+            self._seen[index] = True
+            different = np.flatnonzero(~(amount_ok & currency_ok & status_ok)).tolist()
+            amount_ok, currency_ok, status_ok = (
+                amount_ok.tolist(), currency_ok.tolist(), status_ok.tolist()
+            )
+        else:
+            cents = [to_cents(record.get("amount")) for record in matched]
+            amount_ok, currency_ok, status_ok, different = [], [], [], []
+            for offset, position in enumerate(positions):
+                self._seen[position] = 1
+                amount_ok.append(self._cents[position] == cents[offset])
+                currency_ok.append(self._currencies[position] == currencies[offset])
+                status_ok.append(self._statuses[position] == statuses[offset])
+                if not (amount_ok[-1] and currency_ok[-1] and status_ok[-1]):
+                    different.append(offset)
+
+        for offset in different:
+            fields = tuple(
+                name
+                for name, ok in (
+                    ("amount", amount_ok[offset]),
+                    ("currency", currency_ok[offset]),
+                    ("status", status_ok[offset]),
+                )
+                if not ok
+            )
+            position = positions[offset]
+            yield Discrepancy(
+                "mismatch",
+                self._references[position],
+                fields,
+                ledger=self._ledger_row(position),
+                chapa=matched[offset],
+            )
+
+    def unseen(self) -> List[str]:
+        """References of the ledger that no Chapa record matched yet"""
+        if self._np is not None:
+            return [self._references[i] for i in self._np.flatnonzero(~self._seen).tolist()
+                    if self._index[self._references[i]] == i]
+        return [reference for position, reference in enumerate(self._references)
+                if not self._seen[position] and self._index[reference] == position]
+
+    def missing(self) -> Iterator[Discrepancy]:
+        """
+        Report the ledger rows that no Chapa record matched
+
+        Yields:
+            Discrepancy: a 'missing' discrepancy per unmatched reference
+        """
+        for reference in self.unseen():
+            yield Discrepancy("missing", reference, ledger=self._ledger_row(self._index[reference]))
+
+
+def _verified_record(result: Any) -> Optional[Dict[str, Any]]:
+    """``data`` of a successful verify response, None if the reference is unknown"""
+    if result.error is not None:
+        return None
+    response = _as_dict(result.response)
+    data = response.get("data")
+    if response.get("status") != "success" or not data:
+        return None
+    return _as_dict(data)
+
+
+def _check_kind(kind: str) -> None:
+    if kind not in RECONCILE_KINDS:
+        raise ValueError(f"kind must be one of {', '.join(RECONCILE_KINDS)}")
+
+
+def _reconciler(ledger: Any, kind: str, options: Dict[str, Any]) -> Reconciler:
+    if isinstance(ledger, Reconciler):
+        return ledger
+    if kind == "transfer":
+        # transfer records carry the merchant reference in tx_ref
+        options.setdefault("chapa_key", "tx_ref")
+    return Reconciler(ledger, **options)
+
+
+def reconcile(
+    ledger: Any,
+    records: Optional[Iterable[Any]] = None,
+    chapa: Any = None,
+    kind: str = "transaction",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **options,
+) -> Iterator[Discrepancy]:
+    """
+    Reconcile a ledger with Chapa, streaming the discrepancies
+
+    The Chapa records are compared first; when ``records`` is not given they
+    are listed with ``chapa.iter_transactions``/``iter_transfers``. Then, if
+    ``chapa`` is given, only the ledger references still unmatched are
+    fetched with ``verify``/``verify_transfer``, and the ones Chapa does not
+    know are reported missing.
+
+    Example:
+        for discrepancy in reconcile("ledger.parquet", chapa=chapa):
+            print(discrepancy.kind, discrepancy.reference, discrepancy.fields)
+
+    Args:
+        ledger (str | DataFrame | Iterable[dict] | Reconciler): the ledger, see ``Reconciler``
+        records (Iterable[dict], optional): Chapa records. Defaults to listing them.
+        chapa (Chapa, optional): client used to list and verify. Defaults to None.
+        kind (str, optional): 'transaction' or 'transfer'. Defaults to 'transaction'.
+        concurrency (int, optional): maximum parallel verifications. Defaults to 10.
+        **options: keyword arguments of ``Reconciler``
+
+    Yields:
+        Discrepancy: mismatched and orphaned records, then missing ones
+
+    Raises:
+        ValueError: If neither records nor chapa are given.
+    """
+    _check_kind(kind)
+    if records is None and chapa is None:
+        raise ValueError("records or chapa is required")
+    reconciler = _reconciler(ledger, kind, options)
+    if records is None:
+        records = chapa.iter_transactions() if kind == "transaction" else chapa.iter_transfers()
+    yield from reconciler.feed(records)
+
+    if chapa is not None:
+        verify = chapa.verify if kind == "transaction" else chapa.verify_transfer
+        verified = (
+            _verified_record(result)
+            for result in run_threaded(verify, reconciler.unseen(), concurrency)
+        )
+        yield from reconciler.feed(record for record in verified if record is not None)
+    yield from reconciler.missing()
+
+
+async def reconcile_async(
+    ledger: Any,
+    records: Optional[Union[Iterable[Any], AsyncIterable[Any]]] = None,
+    chapa: Any = None,
+    kind: str = "transaction",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **options,
+) -> AsyncIterator[Discrepancy]:
+    """
+    Async version of ``reconcile`` for ``AsyncChapa``
+
+    Args:
+        ledger (str | DataFrame | Iterable[dict] | Reconciler): the ledger, see ``Reconciler``
+        records (Iterable[dict] | AsyncIterable[dict], optional): Chapa records. Defaults to
+                                                                  listing them.
+        chapa (AsyncChapa, optional): client used to list and verify. Defaults to None.
+        kind (str, optional): 'transaction' or 'transfer'. Defaults to 'transaction'.
+        concurrency (int, optional): maximum concurrent verifications. Defaults to 10.
+        **options: keyword arguments of ``Reconciler``
+
+    Yields:
+        Discrepancy: mismatched and orphaned records, then missing ones
+
+    Raises:
+        ValueError: If neither records nor chapa are given.
+    """
+    _check_kind(kind)
+    if records is None and chapa is None:
+        raise ValueError("records or chapa is required")
+    reconciler = _reconciler(ledger, kind, options)
+    if records is None:
+        records = chapa.iter_transactions() if kind == "transaction" else chapa.iter_transfers()
+    async for discrepancy in reconciler.feed_async(records):
+        yield discrepancy
+
+    if chapa is not None:
+        verify = chapa.verify if kind == "transaction" else chapa.verify_transfer
+
+        async def verified():
+            async for result in run_async(verify, reconciler.unseen(), concurrency):
+                record = _verified_record(result)
+                if record is not None:
+                    yield record
+
+        async for discrepancy in reconciler.feed_async(verified()):
+            yield discrepancy
+    for discrepancy in reconciler.missing():
+        yield discrepancy
+
+
+class _ReconcileModule(ModuleType):
+    """
+    This module, callable as its ``reconcile`` function.
+
+    Importing the submodule binds ``chapa.reconcile`` to it, so ``from chapa
+    import reconcile`` works whatever the import order.
+    """
+
+    def __call__(self, *args, **kwargs) -> Iterator[Discrepancy]:
+        return reconcile(*args, **kwargs)
+
+
+sys.modules[__name__].__class__ = _ReconcileModule
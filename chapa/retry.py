@@ -0,0 +1,136 @@
+"""
+Retry policy for requests sent to the Chapa API
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Collection, Optional
+
+import httpx
+
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+IDEMPOTENCY_KEYS = ("tx_ref", "reference")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+
+    Args:
+        value (str): header value, either delay seconds or an HTTP date
+
+    Returns:
+        float: seconds to wait, None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures.
+
+    Connection errors, timeouts and the ``retry_statuses`` responses are
+    retried. By default only idempotent requests (GET) are retried, such as
+    ``verify``, ``verify_transfer`` and ``get_banks``. With ``retry_posts``
+    POST requests are retried too, but only when their body carries a
+    ``tx_ref`` or ``reference`` so Chapa can detect duplicates.
+
+    ``Retry-After`` is honoured on 429 and 503 responses, up to
+    ``max_retry_after`` seconds: when the server asks to wait longer the
+    request is not retried and the response is returned.
+
+    Use ``RetryPolicy(max_attempts=1)`` to disable retries.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 10.0,
+        retry_statuses: Collection[int] = DEFAULT_RETRY_STATUSES,
+        retry_posts: bool = False,
+        max_retry_after: float = 60.0,
+    ):
+        """
+        Args:
+            max_attempts (int, optional): total attempts including the first one. Defaults to 3.
+            backoff_base (float, optional): backoff of the first retry in seconds. Defaults to 0.5.
+            backoff_cap (float, optional): maximum backoff in seconds. Defaults to 10.
+            retry_statuses (Collection[int], optional): status codes to retry.
+                                                        Defaults to 429, 500, 502, 503 and 504.
+            retry_posts (bool, optional): also retry POSTs keyed by tx_ref/reference.
+                                          Defaults to False.
+            max_retry_after (float, optional): longest Retry-After delay waited for, in
+                                               seconds. Defaults to 60.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_posts = retry_posts
+        self.max_retry_after = max_retry_after
+
+    def allows(self, method: str, data: Optional[dict] = None) -> bool:
+        """True if a request with this method and body may be retried."""
+        if self.max_attempts == 1:
+            return False
+        method = method.upper()
+        if method in IDEMPOTENT_METHODS:
+            return True
+        return (
+            self.retry_posts
+            and method == "POST"
+            and isinstance(data, dict)
+            and any(data.get(key) for key in IDEMPOTENCY_KEYS)
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter backoff before retry number ``attempt`` (starting at 0)."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def next_delay(
+        self,
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt
+
+        Args:
+            attempt (int): number of the attempt that just finished, starting at 0
+            response (httpx.Response, optional): response of the attempt
+            error (Exception, optional): exception raised by the attempt
+
+        Returns:
+            float: seconds to wait before retrying, None to stop
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        if error is not None:
+            if not isinstance(error, httpx.TransportError):
+                return None
+            return self.backoff(attempt)
+
+        if response is None or response.status_code not in self.retry_statuses:
+            return None
+
+        if response.status_code in (429, 503):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
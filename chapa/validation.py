@@ -0,0 +1,120 @@
+"""
+Request validation shared by the sync and async clients
+"""
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+EMAIL_REGEX = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+AMOUNT_REGEX = re.compile(r"\d+(\.\d*)?|\.\d+")
+MAX_AMOUNT_DECIMALS = 2
+
+
+def parse_amount(amount: Any) -> Decimal:
+    """
+    Parse and validate a payment amount
+
+    Integers, floats, decimals and numeric strings are accepted. Booleans,
+    NaN, infinity, zero, negative amounts and amounts with more than two
+    decimals are rejected.
+
+    Args:
+        amount (int | float | str | Decimal): the amount
+
+    Returns:
+        Decimal: the parsed amount
+
+    Raises:
+        ValueError: If the amount is invalid.
+    """
+    if isinstance(amount, bool):
+        raise ValueError("invalid amount")
+    if isinstance(amount, str):
+        amount = amount.strip()
+        if not AMOUNT_REGEX.fullmatch(amount):
+            raise ValueError("invalid amount")
+    elif not isinstance(amount, (int, float, Decimal)):
+        raise ValueError("invalid amount")
+
+    try:
+        # str() keeps the shortest repr of floats, 0.1 stays 0.1
+        value = Decimal(str(amount)) if isinstance(amount, float) else Decimal(amount)
+    except InvalidOperation:
+        raise ValueError("invalid amount") from None
+
+    if not value.is_finite() or value <= 0:
+        raise ValueError("invalid amount")
+    if -value.normalize().as_tuple().exponent > MAX_AMOUNT_DECIMALS:
+        raise ValueError("invalid amount")
+    return value
+
+
+def validate_email(email: Any) -> str:
+    """
+    Validate a customer email
+
+    Args:
+        email (str): the email
+
+    Returns:
+        str: the email
+
+    Raises:
+        ValueError: If the email is invalid.
+    """
+    if not isinstance(email, str) or not EMAIL_REGEX.fullmatch(email):
+        raise ValueError("invalid email")
+    return email
+
+
+def validate_payment(payload: Dict[str, Any]) -> None:
+    """
+    Validate the arguments of ``initialize`` in a single pass
+
+    Args:
+        payload (dict): keyword arguments of ``initialize``
+
+    Raises:
+        ValueError: If a required field is missing or a field is invalid.
+    """
+    if not payload.get("tx_ref"):
+        raise ValueError("invalid tx_ref")
+    parse_amount(payload.get("amount"))
+    email = payload.get("email")
+    if email is not None:
+        validate_email(email)
+
+
+def validate_many(
+    payloads: Iterable[Dict[str, Any]],
+) -> List[Tuple[int, str]]:
+    """
+    Validate a batch of ``initialize`` payloads
+
+    Every payload is checked, the errors are collected instead of stopping
+    at the first one. Duplicate ``tx_ref`` are reported too.
+
+    Args:
+        payloads (Iterable[dict]): keyword arguments of ``initialize``
+
+    Returns:
+        List[Tuple[int, str]]: (index, error message) of every invalid payload,
+                               empty if the whole batch is valid
+    """
+    errors = []
+    seen = set()
+    for index, payload in enumerate(payloads):
+        if not isinstance(payload, dict):
+            errors.append((index, "payload must be a dict"))
+            continue
+        try:
+            validate_payment(payload)
+        except ValueError as error:
+            errors.append((index, str(error)))
+            continue
+        tx_ref: Optional[str] = payload["tx_ref"]
+        if tx_ref in seen:
+            errors.append((index, "duplicate tx_ref"))
+        seen.add(tx_ref)
+    return errors
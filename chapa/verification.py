@@ -0,0 +1,127 @@
+"""
+Cache of transactions that reached a final status
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+TRANSACTION_TERMINAL_STATUSES = frozenset(
+    {"success", "failed", "cancelled", "reversed", "refunded"}
+)
+
+
+def _terminal_status(response: Any) -> Optional[str]:
+    """Return the final status of a raw verify response, None if not final"""
+    if not isinstance(response, dict) or response.get("status") != "success":
+        return None
+    data = response.get("data")
+    if not isinstance(data, dict):
+        return None
+    status = str(data.get("status") or "").lower()
+    return status if status in TRANSACTION_TERMINAL_STATUSES else None
+
+
+class VerificationCache:
+    """
+    LRU cache of verify responses keyed by ``tx_ref``.
+
+    Only transactions in a final status are cached: such a status never
+    changes, so ``verify`` can answer from the cache without a round trip.
+    The cache is filled by successful ``verify`` calls and by verified
+    ``charge.*`` webhooks (see ``record_webhook``).
+
+    A single cache may be shared by several ``Chapa``/``AsyncChapa`` instances
+    and webhook handlers.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600.0):
+        """
+        Args:
+            maxsize (int, optional): maximum transactions remembered. Defaults to 10000.
+            ttl (float, optional): seconds an entry is kept. Defaults to one hour.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, tx_ref: str) -> Optional[Dict]:
+        """
+        Return the cached raw verify response of a transaction
+
+        Args:
+            tx_ref (str): transaction reference
+
+        Returns:
+            dict: the cached response, None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(tx_ref)
+            if entry is None:
+                return None
+            expires, response = entry
+            if expires <= time.monotonic():
+                del self._entries[tx_ref]
+                return None
+            self._entries.move_to_end(tx_ref)
+            return response
+
+    def put(self, tx_ref: str, response: Any) -> bool:
+        """
+        Cache a raw verify response if the transaction is in a final status
+
+        Args:
+            tx_ref (str): transaction reference
+            response (Any): raw verify response
+
+        Returns:
+            bool: True if the response was cached
+        """
+        if _terminal_status(response) is None:
+            return False
+        with self._lock:
+            self._entries[tx_ref] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(tx_ref)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return True
+
+    def record_webhook(self, payload: Dict[str, Any]) -> bool:
+        """
+        Cache the transaction carried by a verified webhook payload
+
+        Only ``charge.*`` events with a ``tx_ref`` in a final status are
+        cached. Never call this with a payload whose signature was not
+        verified.
+
+        Args:
+            payload (dict): the webhook body
+
+        Returns:
+            bool: True if the transaction was cached
+        """
+        if not isinstance(payload, dict):
+            return False
+        tx_ref = payload.get("tx_ref")
+        if not tx_ref or not str(payload.get("event", "")).startswith("charge."):
+            return False
+        data = {key: value for key, value in payload.items() if key != "event"}
+        return self.put(tx_ref, {"message": "Payment details", "status": "success", "data": data})
+
+    def invalidate(self, tx_ref: Optional[str] = None) -> None:
+        """
+        Forget one transaction, or every transaction
+
+        Args:
+            tx_ref (str, optional): transaction to forget. Defaults to all.
+        """
+        with self._lock:
+            if tx_ref is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(tx_ref, None)
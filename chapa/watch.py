@@ -0,0 +1,168 @@
+"""
+Scheduler polling many references until they reach a final status
+"""
+import asyncio
+import heapq
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Iterable,
+    NamedTuple,
+    Optional,
+)
+
+from .batch import Pacer
+
+
+# statuses reported for a reference dropped after ``max_failures`` failed polls
+WATCH_ERROR = "error"
+WATCH_NOT_FOUND = "not_found"
+
+
+class StatusChange(NamedTuple):
+    """
+    A watched reference changed status
+
+    A reference whose polls keep failing is dropped with the status
+    'not_found' (Chapa does not know the reference) or 'error' (the last
+    poll raised ``error`` or got a response without a status).
+    """
+
+    reference: str
+    status: str
+    previous: Optional[str]
+    response: Any
+    final: bool
+    error: Optional[BaseException] = None
+
+
+async def watch(
+    poll: Callable[[str], Awaitable[Any]],
+    references: Iterable[str],
+    status_of: Callable[[Any], Optional[str]],
+    final_statuses: Collection[str],
+    initial_interval: float = 2.0,
+    max_interval: float = 60.0,
+    backoff: float = 1.5,
+    concurrency: int = 10,
+    rate: Optional[float] = None,
+    timeout: Optional[float] = None,
+    max_failures: Optional[int] = 5,
+    not_found: Optional[Callable[[Any], bool]] = None,
+) -> AsyncIterator[StatusChange]:
+    """
+    Poll every reference from one event loop until it reaches a final status
+
+    Each reference has its own polling interval: it starts at
+    ``initial_interval``, grows by ``backoff`` every time the status is
+    unchanged (up to ``max_interval``) and is reset when the status changes.
+    A reference is dropped once its status is final. Failed polls, raising or
+    answering without a status, are retried with the same backoff; after
+    ``max_failures`` in a row the reference is dropped with a final
+    'error' or 'not_found' ``StatusChange``.
+
+    Args:
+        poll (Callable): coroutine function returning the status response of a reference
+        references (Iterable[str]): references to watch
+        status_of (Callable): extracts the status from a response, None if unknown
+        final_statuses (Collection[str]): statuses ending the watch of a reference
+        initial_interval (float, optional): first polling interval in seconds. Defaults to 2.
+        max_interval (float, optional): maximum polling interval in seconds. Defaults to 60.
+        backoff (float, optional): interval multiplier while unchanged. Defaults to 1.5.
+        concurrency (int, optional): maximum polls in flight. Defaults to 10.
+        rate (float, optional): global budget of polls per second. Defaults to no limit.
+        timeout (float, optional): seconds after which the watch stops, even if some
+                                   references are not final. Defaults to no limit.
+        max_failures (int, optional): consecutive failed polls after which a reference
+                                      is dropped, None to retry forever. Defaults to 5.
+        not_found (Callable, optional): tells if a response without status means the
+                                        reference is unknown. Defaults to None.
+
+    Yields:
+        StatusChange: every status change, in the order they are observed
+    """
+    if backoff < 1:
+        raise ValueError("backoff must be at least 1")
+    if max_failures is not None and max_failures < 1:
+        raise ValueError("max_failures must be a positive integer")
+    pacer = Pacer(rate)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    now = time.monotonic()
+    # (next poll time, reference), the first polls happen right away
+    queue = [(now, reference) for reference in dict.fromkeys(references)]
+    heapq.heapify(queue)
+    intervals = {reference: initial_interval for _, reference in queue}
+    statuses = {}
+    failures = dict.fromkeys(intervals, 0)
+    pending = {}
+
+    async def run(reference):
+        await pacer.wait_async()
+        return await poll(reference)
+
+    try:
+        while queue or pending:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                return
+
+            while queue and queue[0][0] <= now and len(pending) < concurrency:
+                _, reference = heapq.heappop(queue)
+                pending[asyncio.ensure_future(run(reference))] = reference
+
+            wait_for = None
+            if queue and len(pending) < concurrency:
+                wait_for = max(0.0, queue[0][0] - now)
+            if deadline is not None:
+                wait_for = min(wait_for, deadline - now) if wait_for is not None else deadline - now
+
+            if not pending:
+                await asyncio.sleep(wait_for or 0)
+                continue
+
+            done, _ = await asyncio.wait(
+                pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                reference = pending.pop(task)
+                interval = intervals[reference]
+                error = task.exception()
+                status = None if error else status_of(task.result())
+
+                if status is None:
+                    failures[reference] += 1
+                    if max_failures is not None and failures[reference] >= max_failures:
+                        unknown = not error and not_found is not None and not_found(task.result())
+                        yield StatusChange(
+                            reference,
+                            WATCH_NOT_FOUND if unknown else WATCH_ERROR,
+                            statuses.get(reference),
+                            None if error else task.result(),
+                            True,
+                            error,
+                        )
+                        del intervals[reference]
+                        continue
+                else:
+                    failures[reference] = 0
+
+                if status is not None and status != statuses.get(reference):
+                    final = status in final_statuses
+                    yield StatusChange(reference, status, statuses.get(reference), task.result(), final)
+                    statuses[reference] = status
+                    if final:
+                        del intervals[reference]
+                        continue
+                    interval = initial_interval
+                else:
+                    interval = min(max_interval, interval * backoff)
+
+                intervals[reference] = interval
+                heapq.heappush(queue, (time.monotonic() + interval, reference))
+    finally:
+        for task in pending:
+            task.cancel()
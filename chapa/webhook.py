@@ -1,15 +1,28 @@
 """
 Chapa Webhook Utilities Module
 """
+import asyncio
 import hmac
 import hashlib
+import inspect
 import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Optional, Union
+
+from .idempotency import IdempotencyStore
+from .verification import VerificationCache
+
+BytesLike = Union[bytes, bytearray, memoryview, str]
 
 
 WEBHOOKS_EVENT_DESCRIPTION = {
     'charge.dispute.create': 'Dispute against company created.',
     'charge.dispute.remind': 'Reminder of an unresolved dispute against company.',
     'charge.dispute.resolve': 'Dispute has been resolved.',
+    'charge.failed': 'Charge has failed or was cancelled.',
     'charge.success': 'Charged successfully.',
     'customeridentification.failed': 'Customer identification failed.',
     'customeridentification.success': 'Customer identified successfully.',
@@ -33,7 +46,12 @@ WEBHOOKS_EVENT_DESCRIPTION = {
 WEBHOOK_EVENTS = WEBHOOKS_EVENT_DESCRIPTION.keys()
 
 
-def verify_webhook(secret_key: str, body: dict, chapa_signature: str) -> bool:
+def verify_webhook(
+    secret_key: str,
+    body: dict,
+    chapa_signature: str,
+    cache: Optional[VerificationCache] = None,
+) -> bool:
     """
     Verify the webhook request
 
@@ -41,9 +59,477 @@ def verify_webhook(secret_key: str, body: dict, chapa_signature: str) -> bool:
         secret_key (str): The secret key
         body (dict): The request body
         chapa_signature (str): The signature from the request headers
+        cache (VerificationCache, optional): cache filled with the transaction of a
+                                             valid charge event. Defaults to None.
 
     Returns:
         bool: True if the request is valid, False otherwise
     """
     signature = hmac.new(secret_key.encode(), json.dumps(body).encode(), hashlib.sha256).hexdigest()
-    return signature == chapa_signature
\ No newline at end of file
+    valid = _signature_matches(signature, chapa_signature)
+    if valid and cache is not None:
+        cache.record_webhook(body)
+    return valid
+
+
+def _signature_matches(expected: str, signature: Optional[str]) -> bool:
+    """Constant-time comparison of hex digests"""
+    if not signature:
+        return False
+    return hmac.compare_digest(expected.encode(), signature.strip().encode())
+
+
+def _to_bytes(chunk: BytesLike) -> BytesLike:
+    return chunk.encode() if isinstance(chunk, str) else chunk
+
+
+class WebhookVerifier:
+    """
+    Reusable webhook signature verifier
+
+    The HMAC key schedule is computed once from the secret, each verification
+    only copies it and hashes the raw request body. The body is never parsed,
+    so the signature is checked against exactly the bytes Chapa signed.
+
+    Example:
+        verifier = WebhookVerifier("secret")
+        verifier.verify(request.body, request.headers.get("Chapa-Signature"))
+    """
+
+    def __init__(self, secret_key: str):
+        """
+        Args:
+            secret_key (str): The secret key
+        """
+        self._hmac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+
+    def signature(self, raw_body: BytesLike) -> str:
+        """
+        Compute the signature of a raw body
+
+        Args:
+            raw_body (bytes | bytearray | memoryview | str): The raw request body
+
+        Returns:
+            str: the hex HMAC-SHA256 signature
+        """
+        digest = self._hmac.copy()
+        digest.update(_to_bytes(raw_body))
+        return digest.hexdigest()
+
+    def verify(self, raw_body: BytesLike, chapa_signature: Optional[str]) -> bool:
+        """
+        Verify a webhook from its raw body
+
+        Args:
+            raw_body (bytes | bytearray | memoryview | str): The raw request body
+            chapa_signature (str): The signature from the request headers
+
+        Returns:
+            bool: True if the request is valid, False otherwise
+        """
+        return _signature_matches(self.signature(raw_body), chapa_signature)
+
+    def verify_stream(
+        self, chunks: Iterable[BytesLike], chapa_signature: Optional[str]
+    ) -> bool:
+        """
+        Verify a webhook whose body is read in chunks, without buffering it
+
+        Args:
+            chunks (Iterable[bytes]): The chunks of the raw request body
+            chapa_signature (str): The signature from the request headers
+
+        Returns:
+            bool: True if the request is valid, False otherwise
+        """
+        digest = self._hmac.copy()
+        for chunk in chunks:
+            digest.update(_to_bytes(chunk))
+        return _signature_matches(digest.hexdigest(), chapa_signature)
+
+    async def verify_stream_async(
+        self, chunks: AsyncIterable[BytesLike], chapa_signature: Optional[str]
+    ) -> bool:
+        """
+        Async version of ``verify_stream``, for ASGI request streams
+
+        Args:
+            chunks (AsyncIterable[bytes]): The chunks of the raw request body
+            chapa_signature (str): The signature from the request headers
+
+        Returns:
+            bool: True if the request is valid, False otherwise
+        """
+        digest = self._hmac.copy()
+        async for chunk in chunks:
+            digest.update(_to_bytes(chunk))
+        return _signature_matches(digest.hexdigest(), chapa_signature)
+
+
+def verify_webhook_bytes(
+    secret_key: str,
+    raw_body: BytesLike,
+    chapa_signature: Optional[str],
+    cache: Optional[VerificationCache] = None,
+) -> bool:
+    """
+    Verify the webhook request from its raw body
+
+    Unlike ``verify_webhook`` the body is not re-serialized, so key order and
+    whitespace are exactly the ones Chapa signed. Use a ``WebhookVerifier``
+    to verify many requests with the same secret.
+
+    Args:
+        secret_key (str): The secret key
+        raw_body (bytes | bytearray | memoryview | str): The raw request body
+        chapa_signature (str): The signature from the request headers
+        cache (VerificationCache, optional): cache filled with the transaction of a
+                                             valid charge event. Defaults to None.
+
+    Returns:
+        bool: True if the request is valid, False otherwise
+    """
+    valid = WebhookVerifier(secret_key).verify(raw_body, chapa_signature)
+    if valid and cache is not None:
+        if isinstance(raw_body, memoryview):
+            raw_body = raw_body.tobytes()
+        try:
+            cache.record_webhook(json.loads(raw_body))
+        except ValueError:
+            pass
+    return valid
+
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[["WebhookEvent"], Any]
+
+
+class InvalidSignatureError(ValueError):
+    """Raised when a webhook signature does not match its body."""
+
+
+def webhook_fingerprint(event: str, reference: Optional[str], signature: Optional[str]) -> str:
+    """
+    Fingerprint a webhook for deduplication
+
+    Args:
+        event (str): event name
+        reference (str): reference (or tx_ref) of the event
+        signature (str): signature from the request headers
+
+    Returns:
+        str: hex digest identifying the event
+    """
+    key = f"{event}\x00{reference or ''}\x00{signature or ''}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class WebhookEvent:
+    """A verified and decoded webhook request"""
+
+    __slots__ = ("event", "payload", "signature", "duplicate")
+
+    def __init__(self, event: str, payload: Dict[str, Any], signature: Optional[str] = None):
+        self.event = event
+        self.payload = payload
+        self.signature = signature
+        self.duplicate = False
+
+    @property
+    def fingerprint(self) -> str:
+        """Identity of the event, shared by the retries of the same webhook"""
+        return webhook_fingerprint(self.event, self.reference or self.tx_ref, self.signature)
+
+    @property
+    def description(self) -> Optional[str]:
+        """Description of the event type"""
+        return WEBHOOKS_EVENT_DESCRIPTION.get(self.event)
+
+    @property
+    def tx_ref(self) -> Optional[str]:
+        """Merchant transaction reference"""
+        return self.payload.get("tx_ref")
+
+    @property
+    def reference(self) -> Optional[str]:
+        """Chapa reference of the transaction or transfer"""
+        return self.payload.get("reference")
+
+    @property
+    def status(self) -> Optional[str]:
+        """Status carried by the event"""
+        return self.payload.get("status")
+
+    def __repr__(self):
+        return f"WebhookEvent({self.event!r}, tx_ref={self.tx_ref!r}, reference={self.reference!r})"
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class WebhookRouter:
+    """
+    Verify webhooks and dispatch them to handlers registered per event
+
+    Handlers are registered for an event of ``WEBHOOKS_EVENT_DESCRIPTION`` or
+    a wildcard pattern such as ``charge.*``. ``dispatch`` and
+    ``dispatch_async`` only verify and decode the request before returning,
+    so the webhook can be acknowledged right away while the handlers run in
+    the background: sync handlers on a thread pool, coroutine handlers as
+    asyncio tasks. At most ``max_pending`` handler calls are queued, further
+    dispatches wait for room (backpressure).
+
+    With an idempotency ``store``, retries of an already received event are
+    flagged as ``duplicate`` and no handler runs for them. If a handler fails
+    the event is forgotten so the next retry from Chapa is processed again.
+
+    Example:
+        router = WebhookRouter("secret")
+
+        @router.on("charge.*")
+        async def on_charge(event):
+            ...
+
+        await router.dispatch_async(request.body, request.headers.get("Chapa-Signature"))
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        max_workers: int = 8,
+        max_pending: int = 1000,
+        on_error: Optional[Callable[[WebhookEvent, BaseException], Any]] = None,
+        store: Optional[IdempotencyStore] = None,
+        verification_cache: Optional[VerificationCache] = None,
+    ):
+        """
+        Args:
+            secret_key (str): The secret key
+            max_workers (int, optional): threads running sync handlers. Defaults to 8.
+            max_pending (int, optional): handler calls queued or running before dispatch
+                                         waits. Defaults to 1000.
+            on_error (Callable, optional): called with the event and the exception when a
+                                           handler fails. Defaults to logging the exception.
+            store (IdempotencyStore, optional): store used to skip duplicate deliveries,
+                                                e.g. MemoryIdempotencyStore. Defaults to None.
+            verification_cache (VerificationCache, optional): cache filled with the transaction
+                                                              of every charge event, share it
+                                                              with the Chapa client. Defaults to None.
+        """
+        self.verifier = WebhookVerifier(secret_key)
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.store = store
+        self.verification_cache = verification_cache
+        self._handlers: List[tuple] = []
+        self._matches: Dict[str, List[Handler]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # futures of the dispatch_async calls waiting for a slot, with their event loop
+        self._waiters: List[tuple] = []
+        self._waiters_lock = threading.Lock()
+        self._tasks = set()
+
+    def add_handler(self, pattern: str, handler: Handler) -> None:
+        """
+        Register a handler
+
+        Args:
+            pattern (str): event name or wildcard pattern, e.g. 'charge.success', 'charge.*', '*'
+            handler (Callable): function or coroutine function called with the WebhookEvent
+
+        Raises:
+            ValueError: If the pattern matches no known event.
+        """
+        if not any(fnmatchcase(event, pattern) for event in WEBHOOK_EVENTS):
+            raise ValueError(f"{pattern} matches no webhook event")
+        self._handlers.append((pattern, handler))
+        self._matches.clear()
+
+    def on(self, pattern: str) -> Callable[[Handler], Handler]:
+        """Decorator version of ``add_handler``"""
+
+        def decorator(handler: Handler) -> Handler:
+            self.add_handler(pattern, handler)
+            return handler
+
+        return decorator
+
+    def handlers_for(self, event: str) -> List[Handler]:
+        """Handlers registered for an event, in registration order"""
+        handlers = self._matches.get(event)
+        if handlers is None:
+            handlers = [
+                handler for pattern, handler in self._handlers if fnmatchcase(event, pattern)
+            ]
+            self._matches[event] = handlers
+        return handlers
+
+    def parse(self, raw_body: BytesLike, chapa_signature: Optional[str]) -> WebhookEvent:
+        """
+        Verify and decode a webhook request
+
+        Args:
+            raw_body (bytes | str): The raw request body
+            chapa_signature (str): The signature from the request headers
+
+        Returns:
+            WebhookEvent: the decoded event
+
+        Raises:
+            InvalidSignatureError: If the signature does not match the body.
+            ValueError: If the body is not a JSON object.
+        """
+        if not self.verifier.verify(raw_body, chapa_signature):
+            raise InvalidSignatureError("invalid webhook signature")
+        if isinstance(raw_body, memoryview):
+            raw_body = raw_body.tobytes()
+        payload = json.loads(raw_body)
+        if not isinstance(payload, dict):
+            raise ValueError("webhook body must be a JSON object")
+        if self.verification_cache is not None:
+            self.verification_cache.record_webhook(payload)
+        return WebhookEvent(str(payload.get("event", "")), payload, chapa_signature)
+
+    def _accept(self, event: WebhookEvent) -> List[Handler]:
+        """Return the handlers to run, none for duplicates"""
+        if self.store is not None and not self.store.add(event.fingerprint):
+            event.duplicate = True
+            return []
+        return self.handlers_for(event.event)
+
+    async def _accept_async(self, event: WebhookEvent) -> List[Handler]:
+        """Async version of ``_accept``, the store is not queried on the event loop"""
+        if self.store is not None and not await self.store.add_async(event.fingerprint):
+            event.duplicate = True
+            return []
+        return self.handlers_for(event.event)
+
+    def _handle_error(self, event: WebhookEvent, error: BaseException) -> None:
+        if self.store is not None:
+            self.store.discard(event.fingerprint)
+        self._report_error(event, error)
+
+    async def _handle_error_async(self, event: WebhookEvent, error: BaseException) -> None:
+        if self.store is not None:
+            await self.store.discard_async(event.fingerprint)
+        self._report_error(event, error)
+
+    def _report_error(self, event: WebhookEvent, error: BaseException) -> None:
+        if self.on_error:
+            self.on_error(event, error)
+        else:
+            logger.error("webhook handler failed for %r", event, exc_info=error)
+
+    def _release_slot(self) -> None:
+        self._slots.release()
+        with self._waiters_lock:
+            waiters, self._waiters = self._waiters, []
+        # every waiter tries again, those finding no room wait for the next release
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:  # the event loop is closed
+                pass
+
+    async def _acquire_slot_async(self) -> None:
+        """Wait for a slot without blocking the event loop, nothing is held if cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._waiters_lock:
+                if self._slots.acquire(blocking=False):
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    def _run(self, handler: Handler, event: WebhookEvent) -> None:
+        try:
+            result = handler(event)
+            if inspect.isawaitable(result):
+                asyncio.run(result)
+        except Exception as error:  # pylint: disable=broad-except
+            self._handle_error(event, error)
+        finally:
+            self._release_slot()
+
+    def dispatch(self, raw_body: BytesLike, chapa_signature: Optional[str]) -> WebhookEvent:
+        """
+        Verify a webhook and run its handlers on the thread pool
+
+        Returns as soon as the handlers are queued. Coroutine handlers run in
+        their own event loop on a worker thread, use ``dispatch_async`` from
+        async code.
+
+        Args:
+            raw_body (bytes | str): The raw request body
+            chapa_signature (str): The signature from the request headers
+
+        Returns:
+            WebhookEvent: the decoded event, ``duplicate`` is True if it was skipped
+
+        Raises:
+            InvalidSignatureError: If the signature does not match the body.
+        """
+        event = self.parse(raw_body, chapa_signature)
+        for handler in self._accept(event):
+            self._slots.acquire()
+            self._executor.submit(self._run, handler, event)
+        return event
+
+    async def _run_async(self, handler: Handler, event: WebhookEvent) -> None:
+        try:
+            if inspect.iscoroutinefunction(handler):
+                await handler(event)
+            else:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._executor, handler, event)
+        except Exception as error:  # pylint: disable=broad-except
+            await self._handle_error_async(event, error)
+        finally:
+            self._release_slot()
+
+    async def dispatch_async(
+        self, raw_body: BytesLike, chapa_signature: Optional[str]
+    ) -> WebhookEvent:
+        """
+        Verify a webhook and schedule its handlers as asyncio tasks
+
+        Returns as soon as the handlers are scheduled, sync handlers run on
+        the thread pool.
+
+        Args:
+            raw_body (bytes | str): The raw request body
+            chapa_signature (str): The signature from the request headers
+
+        Returns:
+            WebhookEvent: the decoded event, ``duplicate`` is True if it was skipped
+
+        Raises:
+            InvalidSignatureError: If the signature does not match the body.
+        """
+        event = self.parse(raw_body, chapa_signature)
+        for handler in await self._accept_async(event):
+            await self._acquire_slot_async()
+            task = asyncio.ensure_future(self._run_async(handler, event))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return event
+
+    async def drain(self) -> None:
+        """Wait for the scheduled async handlers to finish"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop the thread pool
+
+        Args:
+            wait (bool, optional): wait for the running handlers. Defaults to True.
+        """
+        self._executor.shutdown(wait=wait)